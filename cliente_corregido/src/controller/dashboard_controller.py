@@ -17,79 +17,34 @@ import json
 class DashboardController:
 
     @staticmethod
-    def load_products():
-        response = Repository.get_products()
-        if response.status_code != 200:
-            return {"products": 0} 
-        
-        json_response = json.loads(response.text)
-
-        assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
-
-        return {
-            "products": json_response["data"]["response"][0]["count"]
+    def load_highlights():
+        response = Repository.get_highlights()
+        result = {
+            "products": 0,
+            "orders": 0,
+            "providers": 0,
+            "locations": 0,
+            "sales": 0
         }
-
-    @staticmethod
-    def load_providers():
-        response = Repository.get_providers()
         if response.status_code != 200:
-            return {"providers": 0}
-        
-        json_response = json.loads(response.text)
-
-        assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
-
-        return {
-            "providers": json_response["data"]["response"][0]["count"]
-        }
+            return result
 
-    @staticmethod
-    def load_locations():
-        response = Repository.get_locations()
-        if response.status_code != 200:
-            return {"locations": 0}
-        
         json_response = json.loads(response.text)
 
         assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
 
-        return {
-            "locations": json_response["data"]["response"][0]["count"]
-        }
-
-    @staticmethod
-    def load_orders():
-        response = Repository.get_orders()
-        if response.status_code != 200:
-            return {"orders": 0}
-        
-        json_response = json.loads(response.text)
-
-        assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
-
-        return {
-            "orders": json_response["data"]["response"][0]["count"]
-        }
+        # every block of the query holds one of the values
+        data = json_response["data"]
+        for key in ["products", "orders", "providers", "locations"]:
+            result[key] = DashboardController.block_value(data, key, "count")
+        result["sales"] = DashboardController.block_value(data, "sales", "total")
+        return result
 
     @staticmethod
-    def load_sales():
-        response = Repository.get_sales()
-        if response.status_code != 200:
-            return {"sales": 0}
-        
-        json_response = json.loads(response.text)
-        
-        assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
-
-        return {
-            "sales": json_response["data"]["response"][0]["total"]
-        }
+    def block_value(data, block, field):
+        # value of the first entry of a named block, 0 when the block is empty
+        entries = data.get(block) or [{}]
+        return entries[0].get(field, 0)
 
     @staticmethod
     def load_providers_per_location():
@@ -167,65 +122,43 @@ class DashboardController:
         return result
 
     @staticmethod
-    def load_best_sellers():
-        response = Repository.get_best_sellers()
+    def load_product_rankings(first=5):
+        response = Repository.get_product_rankings(first)
+        result = {
+            "best_sellers": [],
+            "worst_sales": [],
+            "most_selled": []
+        }
         if response.status_code != 200:
-            return []
-        result = []
+            return result
+
         json_response = json.loads(response.text)
 
         assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
 
-        for product in json_response["data"]["response"][0:5]:
-            result.append({
+        for product in json_response["data"].get("best", []):
+            result["best_sellers"].append({
                 "invoice": product["times"],
                 "total": int(product["times"]) * float(product["price"]),
             })
-        return result
-
-    @staticmethod
-    def load_worst_sales():
-        response = Repository.get_worst_sales()
-        if response.status_code != 200:
-            return []
-        result = []
-        json_response = json.loads(response.text)
-
-        assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
-
-        for product in json_response["data"]["response"][0:5]:
-            result.append({
+            result["most_selled"].append({
+                "product": product["description"],
+                "times": product["times"]
+            })
+        for product in json_response["data"].get("worst", []):
+            result["worst_sales"].append({
                 "invoice": product["times"],
                 "total": int(product["times"]) * float(product["price"])
             })
         return result
 
-    @staticmethod
-    def load_most_selled_products():
-        response = Repository.get_most_selled_products()
-        if response.status_code != 200:
-            return []
-        result = []
-        json_response = json.loads(response.text)
-
-        assert('data' in json_response.keys())
-        assert('response' in json_response['data'].keys())
-
-        for product in json_response["data"]["response"][0:5]:
-            result.append({
-                "product": product["description"],
-                "times": product["times"]
-            })
-        return result
-    
     @staticmethod
     def load_sales_per_date(start_date_str, end_date_str):
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
 
-        response = Repository.get_sales_per_period()
+        # the period is filtered by the database
+        response = Repository.get_sales_per_period(start_date, end_date)
         if response.status_code != 200:
             return []
         
@@ -236,14 +169,12 @@ class DashboardController:
         assert('response' in json_response['data'].keys())
 
         for sale in json_response["data"]["response"]:
-            sale_date = datetime.strptime(sale["date"], "%Y-%m-%dT%H:%M:%SZ").date()
-            if start_date <= sale_date <= end_date:
-                result.append({
-                    "date": sale["date"],
-                    "product": sale["product"],
-                    "total_price": sale["product"][0]["price"]
-                    
-                })
+            result.append({
+                "date": sale["date"],
+                "product": sale["product"],
+                "total_price": sale["product"][0]["price"]
+                
+            })
         return result
     
 
@@ -252,7 +183,8 @@ class DashboardController:
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
 
-        response = Repository.get_product_per_period()
+        # the period is filtered by the database
+        response = Repository.get_product_per_period(start_date, end_date)
         if response.status_code != 200:
             return []
         
@@ -265,19 +197,16 @@ class DashboardController:
         sorted_sales = sorted(json_response["data"]["response"], key=lambda x: x["product"][0]["times"], reverse=True)
 
         for sale in sorted_sales:
-            sale_date = datetime.strptime(sale["date"], "%Y-%m-%dT%H:%M:%SZ").date()
-            if start_date <= sale_date <= end_date:
-
-                product_info = {
-                    "date": sale["date"],
-                    "quantity": sale["quantity"],
-                    "total": sale["total"],
-                    "description": sale["product"][0]["description"],
-                    "times": sale["product"][0]["times"]
-                }
-                # If the product is not already in the result list, add it
-                if product_info not in result:
-                    result.append(product_info)
+            product_info = {
+                "date": sale["date"],
+                "quantity": sale["quantity"],
+                "total": sale["total"],
+                "description": sale["product"][0]["description"],
+                "times": sale["product"][0]["times"]
+            }
+            # If the product is not already in the result list, add it
+            if product_info not in result:
+                result.append(product_info)
 
         return result
 
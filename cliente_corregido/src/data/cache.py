@@ -0,0 +1,71 @@
+##!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------
+# Archivo: cache.py
+# Capitulo: Flujo de Datos
+# Descripción:
+#
+#   Este archivo define la caché de las respuestas de las consultas, que
+#   se conservan durante un tiempo configurable y se descartan cuando el
+#   gestor de datos termina una nueva carga
+#
+#-------------------------------------------------------------------------
+from os.path import abspath, dirname, join
+from src.data.provider import Provider
+import os, threading, time
+
+# seconds a response is kept
+ttl = float(os.environ.get("CACHE_TTL", "60"))
+# file written by the gestor once a load finishes
+marker = os.environ.get("LOAD_MARKER", join(dirname(abspath("main.py")), "..", "gestor-de-datos_corregido", "gestor-de-datos_corregido", "result.txt"))
+
+class QueryCache:
+
+    entries = {}
+    locks = {}
+    stamp = None
+    lock = threading.Lock()
+
+    @staticmethod
+    def execute(query):
+        # the response of a query is kept by its text, users asking for the
+        # same query at once wait for a single request
+        stamp = QueryCache.load_stamp()
+        with QueryCache.lock:
+            if stamp != QueryCache.stamp:
+                # a new load finished, every response is outdated
+                QueryCache.entries.clear()
+                QueryCache.locks.clear()
+                QueryCache.stamp = stamp
+            query_lock = QueryCache.locks.setdefault(query, threading.Lock())
+
+        with query_lock:
+            entry = QueryCache.entries.get(query)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            response = Provider.execute(query)
+            # failed requests are not kept so the next one tries again
+            if response.status_code == 200:
+                with QueryCache.lock:
+                    if stamp == QueryCache.stamp:
+                        QueryCache.prune()
+                        QueryCache.entries[query] = (time.monotonic() + ttl, response)
+            return response
+
+    @staticmethod
+    def prune():
+        # drops the expired responses, called with the lock held
+        now = time.monotonic()
+        for query in [query for query, entry in QueryCache.entries.items() if entry[0] <= now]:
+            del QueryCache.entries[query]
+            QueryCache.locks.pop(query, None)
+
+    @staticmethod
+    def load_stamp():
+        # size and modification time of the load marker, None when the gestor
+        # never wrote it, in which case only the ttl applies
+        try:
+            stat = os.stat(marker)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
\ No newline at end of file
@@ -14,54 +14,31 @@
 class Queries:
 
     @staticmethod
-    def get_total_products():
+    def get_highlights():
+        # every count of the highlight cards as a named block of one query
         return """
             {
-                response(func: has(description)) {
+                products(func: has(description)) {
                     count(uid)
                 }
-            }
-        """
 
-    @staticmethod
-    def get_total_providers():
-        return """
-            {
-                response(func: has(pid)) {
+                orders(func: has(invoice)) {
                     count(uid)
                 }
-            }
-        """
 
-    @staticmethod
-    def get_total_locations():
-        return """
-            {
-                response(func: has(name)) {
+                providers(func: has(pid)) {
                     count(uid)
                 }
-            }
-        """
 
-    @staticmethod
-    def get_total_orders():
-        return """
-            {
-                response(func: has(invoice)) {
+                locations(func: has(name)) {
                     count(uid)
                 }
-            }
-        """
 
-    @staticmethod
-    def get_total_sales():
-        return """
-            {
                 var(func: has(invoice)) {
                     t as total
                 }
 
-                response() {
+                sales() {
                     total: sum(val(t))
                 }
             }
@@ -110,61 +87,44 @@ class Queries:
         """
 
     @staticmethod
-    def get_best_sellers():
+    def get_product_rankings(first):
+        # the best and worst selling products share one count of bought,
+        # the best ones are also the most sold
         return """
             {
                 var(func: has(description)) {
-                    c as count(bought) 
+                    c as count(bought)
                 }
-                    
-                response(func: has(description), orderdesc: val(c)){
+
+                best(func: has(description), orderdesc: val(c), first: %d) {
                     description
                     times: val(c)
                     price
                 }
-            }
-        """
 
-    @staticmethod
-    def get_worst_sales():
-        return """
-            {
-                var(func: has(description)) {
-                    c as count(bought) 
-                }
-                    
-                response(func: has(description), orderasc: val(c)){
+                worst(func: has(description), orderasc: val(c), first: %d) {
                     description
                     times: val(c)
                     price
                 }
             }
-        """
+        """ % (first, first)
 
     @staticmethod
-    def get_most_selled_products():
+    def get_sales(start_date, end_date):
+        # only the orders of the period are read, using the index of date,
+        # and only their products are counted
         return """
             {
-                var(func: has(description)) {
-                    c as count(bought) 
-                }
-                    
-                response(func: has(description), orderdesc: val(c)){
-                    description
-                    times: val(c)
+                orders as var(func: ge(date, "%s")) @filter(le(date, "%sT23:59:59")) {
+                    products as ~bought
                 }
-            }
-        """
-    
-    @staticmethod
-    def get_sales():
-        return """
-            {
-                var(func: has(description)) {
-                    c as count(bought) 
+
+                var(func: uid(products)) {
+                    c as count(bought)
                 }
 
-                response(func: has(date)) {
+                response(func: uid(orders)) {
                     date
                     product:~bought{
                         description
@@ -173,17 +133,21 @@ class Queries:
                     }
                 }
             }
-        """
+        """ % (start_date.isoformat(), end_date.isoformat())
     
     @staticmethod
-    def get_product_per_period():
+    def get_product_per_period(start_date, end_date):
         return """
         {
-            var(func: has(description)) {
+            orders as var(func: ge(date, "%s")) @filter(le(date, "%sT23:59:59")) {
+                products as ~bought
+            }
+
+            var(func: uid(products)) {
                 c as count(bought)
             }
 
-            response(func: has(date), orderdesc: val(c)) {
+            response(func: uid(orders), orderdesc: val(c)) {
                 date
                 invoice
                 quantity
@@ -194,4 +158,4 @@ class Queries:
                 }
             }
         }
-    """
\ No newline at end of file
+    """ % (start_date.isoformat(), end_date.isoformat())
\ No newline at end of file
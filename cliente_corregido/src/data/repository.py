@@ -11,72 +11,42 @@
 #   y el API
 #
 #-------------------------------------------------------------------------
-from src.data.provider import Provider
+from src.data.cache import QueryCache
 from src.data.queries import Queries
 
 class Repository:
 
     @staticmethod
-    def get_products():
-        response = Provider.execute(Queries.get_total_products())
-        return response
-
-    @staticmethod
-    def get_providers():
-        response = Provider.execute(Queries.get_total_providers())
-        return response
-
-    @staticmethod
-    def get_locations():
-        response = Provider.execute(Queries.get_total_locations())
-        return response
-
-    @staticmethod
-    def get_orders():
-        response = Provider.execute(Queries.get_total_orders())
-        return response
-
-    @staticmethod
-    def get_sales():
-        response = Provider.execute(Queries.get_total_sales())
+    def get_highlights():
+        response = QueryCache.execute(Queries.get_highlights())
         return response
 
     @staticmethod
     def get_providers_by_location():
-        response = Provider.execute(Queries.get_providers_per_location())
+        response = QueryCache.execute(Queries.get_providers_per_location())
         return response
 
     @staticmethod
     def get_sales_by_location():
-        response = Provider.execute(Queries.get_sales_per_location())
+        response = QueryCache.execute(Queries.get_sales_per_location())
         return response
 
     @staticmethod
     def get_orders_by_location():
-        response = Provider.execute(Queries.get_orders_per_location())
+        response = QueryCache.execute(Queries.get_orders_per_location())
         return response
 
     @staticmethod
-    def get_best_sellers():
-        response = Provider.execute(Queries.get_best_sellers())
+    def get_product_rankings(first):
+        response = QueryCache.execute(Queries.get_product_rankings(first))
         return response
 
     @staticmethod
-    def get_worst_sales():
-        response = Provider.execute(Queries.get_worst_sales())
-        return response
-    
-    @staticmethod
-    def get_most_selled_products():
-        response = Provider.execute(Queries.get_most_selled_products())
-        return response
-    
-    @staticmethod
-    def get_sales_per_period():
-        response = Provider.execute(Queries.get_sales())
+    def get_sales_per_period(start_date, end_date):
+        response = QueryCache.execute(Queries.get_sales(start_date, end_date))
         return response
     
     @staticmethod
-    def get_product_per_period():
-        response = Provider.execute(Queries.get_product_per_period())
+    def get_product_per_period(start_date, end_date):
+        response = QueryCache.execute(Queries.get_product_per_period(start_date, end_date))
         return response
\ No newline at end of file
@@ -63,15 +63,17 @@ class Dashboard:
         ])
     
     def _stats_tab_content(self):
+        # the three panels are filled by a single request
+        rankings = DashboardController.load_product_rankings()
         return html.Div([
             dbc.Row([
-                dbc.Col(self._panel_best_sellers(), width=6),
-                dbc.Col(self._panel_worst_sales(), width=6),
+                dbc.Col(self._panel_best_sellers(rankings["best_sellers"]), width=6),
+                dbc.Col(self._panel_worst_sales(rankings["worst_sales"]), width=6),
             ]),
             html.Div(),
             html.Br(),
             dbc.Row(
-                [dbc.Col(self._panel_most_selled_products())]
+                [dbc.Col(self._panel_most_selled_products(rankings["most_selled"]))]
             )
         ])
     
@@ -141,29 +143,25 @@ class Dashboard:
         )
 
     def _highlights_cards(self):
-        products = DashboardController.load_products()
-        orders = DashboardController.load_orders()
-        providers = DashboardController.load_providers()
-        locations = DashboardController.load_locations()
-        sales = DashboardController.load_sales()
+        highlights = DashboardController.load_highlights()
         return html.Div(
             [
                 dbc.Row(
                     [
                         dbc.Col(
-                            self._card_value("Products", products["products"])
+                            self._card_value("Products", highlights["products"])
                         ),
                         dbc.Col(
-                            self._card_value("Orders", orders["orders"])
+                            self._card_value("Orders", highlights["orders"])
                         ),
                         dbc.Col(
-                            self._card_value("Providers", providers["providers"])
+                            self._card_value("Providers", highlights["providers"])
                         ),
                         dbc.Col(
-                            self._card_value("Locations", locations["locations"])
+                            self._card_value("Locations", highlights["locations"])
                         ),
                         dbc.Col(
-                            self._card_value("Sales", "$ {:,.2f}".format(float(sales['sales'])))
+                            self._card_value("Sales", "$ {:,.2f}".format(float(highlights['sales'])))
                         ),
                     ]
                 ),
@@ -221,8 +219,7 @@ class Dashboard:
             ]
         )
 
-    def _panel_best_sellers(self):
-        best_sellers = DashboardController.load_best_sellers()
+    def _panel_best_sellers(self, best_sellers):
         return html.Div(
             [
                 dbc.Card(
@@ -253,8 +250,7 @@ class Dashboard:
             ]
         )
 
-    def _panel_worst_sales(self):
-        worst_sales = DashboardController.load_worst_sales()
+    def _panel_worst_sales(self, worst_sales):
         return html.Div(
             [
                 dbc.Card(
@@ -285,8 +281,7 @@ class Dashboard:
             ]
         )
 
-    def _panel_most_selled_products(self):
-        most_selled = DashboardController.load_most_selled_products()
+    def _panel_most_selled_products(self, most_selled):
         return html.Div(
             [
                 dbc.Card(
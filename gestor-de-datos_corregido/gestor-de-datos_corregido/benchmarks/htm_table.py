@@ -0,0 +1,55 @@
+##!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------
+# Archivo: htm_table.py
+# Capitulo: Flujo de Datos
+# Descripción:
+#
+#   Este archivo compara la extracción de la tabla del archivo HTM con
+#   BeautifulSoup y con el lector por eventos TableParser, verificando que
+#   ambos obtengan los mismos registros, se ejecuta desde la carpeta del
+#   componente con:
+#
+#       python -m benchmarks.htm_table
+#-------------------------------------------------------------------------
+from src.helpers.html_table import TableParser
+from bs4 import BeautifulSoup
+from os.path import join
+import os, time
+
+
+def soup_rows(path):
+    with open(path) as htm_file:
+        soup = BeautifulSoup(htm_file, "html.parser")
+        table = soup.find("table", attrs={"class":"table-bordered"})
+        headers = [th.get_text() for th in table.find("tr").find_all("th")]
+        return [dict(zip(headers, (td.get_text() for td in row.find_all("td")))) for row in table.find_all("tr")[1:]]
+
+
+def parser_rows(path):
+    with open(path) as htm_file:
+        rows = TableParser.read(htm_file, "table-bordered")
+        headers = [text for tag, text in next(rows) if tag == "th"]
+        return [dict(zip(headers, (text for tag, text in row if tag == "td"))) for row in rows]
+
+
+def best_time(function, path, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == '__main__':
+    project_dir = os.path.dirname(os.path.abspath("loader.py"))
+    path = join(project_dir, "assets", "source.htm")
+
+    assert soup_rows(path) == parser_rows(path)
+
+    soup_time = best_time(soup_rows, path)
+    parser_time = best_time(parser_rows, path)
+    print(f"BeautifulSoup: {soup_time * 1000:.1f} ms")
+    print(f"TableParser:   {parser_time * 1000:.1f} ms ({soup_time / parser_time:.1f}x)")
\ No newline at end of file
@@ -0,0 +1,69 @@
+##!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------
+# Archivo: result_formats.py
+# Capitulo: Flujo de Datos
+# Descripción:
+#
+#   Este archivo compara el tamaño, el tiempo de lectura y el tiempo de
+#   recorrido de una columna (suma de total) de los formatos intermedios
+#   (json, ndjson y arrow) usando los archivos de la carpeta result, se
+#   ejecuta desde la carpeta del componente con:
+#
+#       python -m benchmarks.result_formats
+#-------------------------------------------------------------------------
+from src.helpers.results import ResultWriter, ResultReader, ArrowResults
+from src.helpers.record import Record
+from os.path import join, getsize
+import os, json, time, tempfile
+
+FORMATS = ["json", "ndjson", "arrow"]
+
+
+def write(records, path, format):
+    with open(path, "wb" if format == "arrow" else "w") as out:
+        writer = ResultWriter(out, format)
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+
+def best_time(function, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def parse(path, format):
+    with open(path, "rb" if format == "arrow" else "r") as file:
+        for _ in ResultReader.read(file):
+            pass
+
+
+def scan_total(path, format):
+    if format == "arrow":
+        ArrowResults.load()
+        import pyarrow.compute
+        return sum(pyarrow.compute.sum(array).as_py() for array in ArrowResults.scan(path, "total"))
+    with open(path) as file:
+        return sum(record.total for record in ResultReader.read(file))
+
+
+if __name__ == '__main__':
+    project_dir = os.path.dirname(os.path.abspath("loader.py"))
+    result_dir = join(project_dir, "result")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{'file':<6} {'format':<8} {'size (KB)':>10} {'parse (ms)':>11} {'scan (ms)':>10}")
+        for name in ["csv", "xml", "htm", "txt"]:
+            with open(join(result_dir, f"{name}.json")) as json_file:
+                records = [Record.from_dict(r) for r in json.load(json_file)]
+            for format in FORMATS:
+                path = join(tmp_dir, f"{name}.{format}")
+                write(records, path, format)
+                parse_ms = best_time(lambda: parse(path, format)) * 1000
+                scan_ms = best_time(lambda: scan_total(path, format)) * 1000
+                print(f"{name:<6} {format:<8} {getsize(path) / 1024:>10.1f} {parse_ms:>11.2f} {scan_ms:>10.2f}")
\ No newline at end of file
@@ -0,0 +1,70 @@
+##!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------
+# Archivo: vectorized_engine.py
+# Capitulo: Flujo de Datos
+# Descripción:
+#
+#   Este archivo compara el motor de transformación registro por registro
+#   con el motor vectorizado (pandas) sobre un archivo CSV sintético,
+#   verificando que ambos generen los mismos registros, se ejecuta desde la
+#   carpeta del componente indicando opcionalmente la cantidad de filas
+#   (por defecto 10 millones) con:
+#
+#       python -m benchmarks.vectorized_engine 10000000
+#-------------------------------------------------------------------------
+from src.transformers.csv_transformer import CSVTransformer
+from os.path import join, getsize
+import itertools, random, sys, tempfile, time
+
+COUNTRIES = ["France", "Germany", "Spain", "United Kingdom", "Brazil", "Peru"]
+
+
+def rows(count):
+    rnd = random.Random(0)
+    for i in range(count):
+        # about one row in a hundred has no description
+        description = "" if rnd.random() < 0.01 else f"PRODUCT {rnd.randrange(5000)}"
+        yield [str(536370 + i // 20), description, str(rnd.randrange(1, 50)), "12/01/2010 08:45",
+            f"{rnd.randrange(1, 2000) / 100}", str(rnd.randrange(12000, 18000)), rnd.choice(COUNTRIES)]
+
+
+def write_csv(path, count):
+    with open(path, "w") as out:
+        out.write("inv,product_desc,qty,InvoiceDate,raw_price,provider,country_name\n")
+        for row in rows(count):
+            out.write(",".join(row) + "\n")
+
+
+def python_csv(path):
+    with open(path) as source:
+        yield from CSVTransformer.entries(source)
+
+
+def pandas_csv(path):
+    with open(path) as source:
+        yield from CSVTransformer.frames(source)
+
+
+def consume(records):
+    start = time.perf_counter()
+    count = sum(1 for _ in records)
+    return count, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = join(tmp, "source.csv")
+        write_csv(path, count)
+
+        # both engines have to produce the same records
+        sample = min(count, 200000)
+        assert list(itertools.islice(python_csv(path), sample)) == list(itertools.islice(pandas_csv(path), sample))
+
+        rows_python, python_time = consume(python_csv(path))
+        rows_vectorized, vectorized_time = consume(pandas_csv(path))
+        assert rows_python == rows_vectorized
+        print(f"csv: {count} rows, {getsize(path) / 1024 / 1024:.1f} MB, {rows_python} records")
+        print(f"    python: {python_time:.2f} s ({rows_python / python_time:.0f} rows/sec)")
+        print(f"    pandas: {vectorized_time:.2f} s ({rows_vectorized / vectorized_time:.0f} rows/sec, {python_time / vectorized_time:.1f}x)")
\ No newline at end of file
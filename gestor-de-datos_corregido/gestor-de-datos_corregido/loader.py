@@ -17,89 +17,445 @@ from src.transformers.txt_transformer import TXTTransformer
 from src.helpers.provider import Provider
 from src.helpers.queries import Queries
 from src.helpers.processor import Processor
-import luigi, json, time
+from src.helpers.cache import UIDCache, EdgeSet
+from src.helpers.upsert import Upsert
+from src.helpers.workers import WorkerPool
+from src.helpers.results import ResultReader
+from src.helpers.checkpoint import LoadCheckpoint
+from os.path import join
+import luigi, time, sys, gzip, hashlib
+
+
+# predicate and record field that identify each kind of node, providers
+# are created after locations because they belong to one
+KEYS = {
+    "location": ("name", "country"),
+    "provider": ("pid", "provider"),
+    "order": ("invoice", "invoice"),
+    "product": ("description", "description")
+}
+
+# queries that read and add each relation
+RELATIONS = {
+    "belongs": (Queries.query_belongs, Queries.add_belongs_relation),
+    "bought": (Queries.query_boughts, Queries.add_bought_relation),
+    "sold": (Queries.query_sold, Queries.add_sold_relation)
+}
 
 
 class Loader(luigi.Task):
 
+    # number of rows sent per upsert request, 0 keeps the row by row load
+    batch_size = luigi.IntParameter(default=0)
+    # pulls every existing key before loading, so no existence query is needed
+    prewarm = luigi.BoolParameter(default=False)
+    # number of nodes requested per page while pre-warming
+    page_size = luigi.IntParameter(default=10000)
+    # seconds to wait for each Dgraph request and retries of failed connections
+    timeout = luigi.FloatParameter(default=60)
+    retries = luigi.IntParameter(default=3)
+    # number of threads sending requests to Dgraph
+    load_workers = luigi.IntParameter(default=1)
+    # loads every record again instead of only those new since the last run
+    full = luigi.BoolParameter(default=False)
+    # rows sent between two saves of the load progress, a retry resumes from
+    # the last save, 0 disables them
+    checkpoint_rows = luigi.IntParameter(default=1000)
+    # rows committed together in one transaction, 0 commits every mutation
+    txn_rows = luigi.IntParameter(default=0)
+    # folder where the graph is written as gzipped N-Quads with its schema for
+    # Dgraph's bulk loader instead of being loaded, empty loads it live
+    export = luigi.Parameter(default="")
+
     def requires(self):
         return CSVTransformer(), XMLTransformer(), HTMTransformer(), TXTTransformer()
 
     def run(self):
+        if self.export:
+            self.export_graph()
+            return
+
+        Provider.configure(pool_size=self.load_workers, timeout=self.timeout, retries=self.retries, transactions=self.txn_rows > 0)
+
         # creates the schema
         Provider.perform_alter(Queries.get_schema())
 
-        files = []
-        for file in self.input():
-            with file.open('r') as json_file:
-                print(f"processing file {json_file.name}...")
-                files.append(json_file.name)
-                products = json.load(json_file)
-                for p in products:
+        # uids of the entities and relations already seen, shared by every
+        # file of the run
+        self.cache = UIDCache()
+        self.edges = EdgeSet()
+        if self.prewarm:
+            self.prewarm_cache()
+            self.prewarm_edges()
 
-                    if not p["description"]:
-                        continue
+        self.pool = WorkerPool(self.load_workers) if self.load_workers > 1 else None
+        self.uncommitted = 0
+        try:
+            files = []
+            for file in self.input():
+                with file.open('r') as json_file:
+                    print(f"processing file {json_file.name}...")
+                    files.append(json_file.name)
+                    # records already loaded by the last successful run are
+                    # skipped unless a full load is requested, as well as the
+                    # ones a failed run sent before its last saved progress
+                    checkpoint = self.checkpoint = LoadCheckpoint.read(file.path, self.full)
+                    if checkpoint.offset:
+                        print(f"...resuming after row {checkpoint.offset} (chunk {checkpoint.chunk})")
+                    products = checkpoint.new(ResultReader.read(json_file))
+                    if self.pool:
+                        self.load_concurrently(products)
+                    elif self.batch_size > 0:
+                        self.load_batches(products)
                     else:
-                        p['description'] = p['description'].replace("\"", "'")
-
-                    # location
-                    loc_query_res = Provider.perform_query(Queries.query_name(p["country"]))
-                    location = Processor.extract_query_uid(loc_query_res)
-                    if not location:
-                        mutation_res = Provider.perform_mutate(Queries.create_location(p["country"]))
-                        location = Processor.extract_created_uid(mutation_res, "location")
-                    
-                    # provider
-                    prov_query_res = Provider.perform_query(Queries.query_pid(p["provider"]))
-                    provider = Processor.extract_query_uid(prov_query_res)
-                    if not provider:
-                        mutation_res = Provider.perform_mutate(Queries.create_provider(p['provider'], location))
-                        provider = Processor.extract_created_uid(mutation_res, "provider")
-
-                    # location and provider
-                    loc_pro_query_res = Provider.perform_query(Queries.query_belongs(provider))
-                    relations = Processor.extract_relation_uids(loc_pro_query_res, "belongs")
-                    if not location in relations:
-                        Provider.perform_mutate(Queries.add_belongs_relation(provider, location))
-
-                    # order
-                    ord_query_res = Provider.perform_query(Queries.query_invoice(p["invoice"]))
-                    order = Processor.extract_query_uid(ord_query_res)
-                    if not order:
-                        date = Processor.compute_random_date()
-                        mutation_res = Provider.perform_mutate(Queries.create_order(p["invoice"], p["quantity"], p["total"], date))
-                        order = Processor.extract_created_uid(mutation_res, "order")
-                    
-                    # product
-                    prod_query_res = Provider.perform_query(Queries.query_desc(p["description"]))
-                    product = Processor.extract_query_uid(prod_query_res)
-                    if not product:
-                        mutation_res = Provider.perform_mutate(Queries.create_product(p["description"], p["price"]))
-                        product = Processor.extract_created_uid(mutation_res, "product")
-
-                    # product and order
-                    prod_ord_query_res = Provider.perform_query(Queries.query_boughts(product))
-                    relations = Processor.extract_relation_uids(prod_ord_query_res, "bought")
-                    if not order in relations:
-                        Provider.perform_mutate(Queries.add_bought_relation(product, order))
-
-                    # product and provider
-                    prod_prov_query_res = Provider.perform_query(Queries.query_sold(product))
-                    relations = Processor.extract_relation_uids(prod_prov_query_res, "sold")
-                    if not provider in relations:
-                        Provider.perform_mutate(Queries.add_sold_relation(product, provider))
-            print(f"...file {json_file.name} processed\n")
+                        self.load_rows(products)
+                    # the rows left of the file are committed, the next file
+                    # starts a transaction of its own
+                    self.commit_transaction()
+                    self.uncommitted = 0
+                checkpoint.save()
+                print(f"...{checkpoint.skipped} rows already loaded")
+                print(f"...file {json_file.name} processed\n")
+        finally:
+            if self.pool:
+                self.pool.close()
+                for line in self.pool.report():
+                    print(line)
+        print(f"uid cache: {self.cache.stats()}")
+        print(f"edge set: {len(self.edges)} edges")
 
         with self.output().open('w') as f:
             for name in files:
                 f.write('...file {name} processed\n'.format(name=name))
 
+    def prewarm_cache(self):
+        for kind, (predicate, field) in KEYS.items():
+            after = "0x0"
+            while True:
+                query_res = Provider.perform_query(Queries.query_keys(predicate, self.page_size, after))
+                keys = self.read_page(query_res, Processor.extract_keys, predicate, f"{kind} pre-warm")
+                for key, uid in keys:
+                    self.cache.warm(kind, key, uid)
+                if len(keys) < self.page_size:
+                    break
+                after = keys[-1][1]
+            # only once every page came back clean
+            self.cache.mark_complete(kind)
+        print(f"uid cache pre-warmed with {len(self.cache)} uids")
+
+    def prewarm_edges(self):
+        for predicate in RELATIONS:
+            after = "0x0"
+            while True:
+                query_res = Provider.perform_query(Queries.query_edges(predicate, self.page_size, after))
+                subjects = self.read_page(query_res, Processor.extract_edges, predicate, f"{predicate} pre-warm")
+                for subject, objects in subjects:
+                    self.edges.load(subject, predicate, objects)
+                if len(subjects) < self.page_size:
+                    break
+                after = subjects[-1][0]
+            self.edges.mark_complete(predicate)
+        print(f"edge set pre-warmed with {len(self.edges)} edges")
+
+    def read_page(self, response, extract, predicate, label):
+        # a failed page stops the run, otherwise the kind would be marked as
+        # complete with some of its keys missing
+        errors = Processor.extract_errors(response)
+        if errors:
+            raise RuntimeError(f"{label} failed: {errors}")
+        page = extract(response, predicate)
+        if page is None:
+            raise RuntimeError(f"{label} failed: {response.text}")
+        return page
+
+    def load_rows(self, products):
+        for p in products:
+
+            if not p.description:
+                continue
+            else:
+                p.description = p.description.replace("\"", "'")
+
+            # location
+            location = self.resolve_node("location", p)
+
+            # provider
+            provider = self.resolve_node("provider", p, location)
+
+            # location and provider
+            self.link(provider, "belongs", location)
+
+            # order
+            order = self.resolve_node("order", p)
+
+            # product
+            product = self.resolve_node("product", p)
+
+            # product and order
+            self.link(product, "bought", order)
+
+            # product and provider
+            self.link(product, "sold", provider)
+
+            self.commit(1)
+
+    def resolve_node(self, kind, p, location=None):
+        if kind == "location":
+            return self.resolve(kind, p.country,
+                Queries.query_name(p.country),
+                lambda: Queries.create_location(p.country))
+        if kind == "provider":
+            return self.resolve(kind, p.provider,
+                Queries.query_pid(p.provider),
+                lambda: Queries.create_provider(p.provider, location),
+                [("belongs", location)])
+        if kind == "order":
+            return self.resolve(kind, p.invoice,
+                Queries.query_invoice(p.invoice),
+                lambda: Queries.create_order(p.invoice, p.quantity, p.total, Processor.compute_random_date()))
+        return self.resolve(kind, p.description,
+            Queries.query_desc(p.description),
+            lambda: Queries.create_product(p.description, p.price))
+
+    def resolve(self, kind, key, query, create, relations=()):
+        uid = self.cache.get(kind, key)
+        if uid:
+            return uid
+
+        if not self.cache.is_complete(kind):
+            query_res = Provider.perform_query(query)
+            uid = Processor.extract_query_uid(query_res)
+        if not uid:
+            mutation_res = Provider.perform_mutate(create())
+            uid = Processor.extract_created_uid(mutation_res, kind)
+            if uid:
+                # the new node only has the relations set on its creation
+                self.edges.track(uid)
+                for predicate, obj in relations:
+                    self.edges.add(uid, predicate, obj)
+
+        self.cache.put(kind, key, uid)
+        return uid
+
+    def link(self, subject, predicate, obj):
+        query, create = RELATIONS[predicate]
+
+        # the edges of a node are fetched once per run, after that the
+        # relation is checked against the edge set
+        if not self.edges.is_loaded(subject, predicate):
+            query_res = Provider.perform_query(query(subject))
+            self.edges.load(subject, predicate, Processor.extract_relation_uids(query_res, predicate))
+
+        if (subject, predicate, obj) in self.edges:
+            return
+
+        Provider.perform_mutate(create(subject, obj))
+        self.edges.add(subject, predicate, obj)
+
+    def load_batches(self, products):
+        rows = 0
+        chunk = []
+        start = time.time()
+        for p in products:
+            if not p.description:
+                continue
+            chunk.append(p)
+            if len(chunk) == self.batch_size:
+                self.send(self.build_upsert(chunk), f"chunk starting at row {rows}")
+                self.commit(len(chunk))
+                rows += len(chunk)
+                chunk = []
+        if chunk:
+            self.send(self.build_upsert(chunk), f"chunk starting at row {rows}")
+            self.commit(len(chunk))
+            rows += len(chunk)
+        self.report(rows, start)
+
+    def build_upsert(self, chunk):
+        upsert = Upsert(self.cache, self.edges)
+        for p in chunk:
+            p.description = p.description.replace("\"", "'")
+
+            location = self.upsert_node(upsert, "location", p)
+            provider = self.upsert_node(upsert, "provider", p)
+            order = self.upsert_node(upsert, "order", p)
+            product = self.upsert_node(upsert, "product", p)
+
+            upsert.relate(provider, "belongs", location)
+            upsert.relate(product, "bought", order)
+            upsert.relate(product, "sold", provider)
+        return upsert
+
+    def upsert_node(self, upsert, kind, p):
+        predicate, field = KEYS[kind]
+        return upsert.node(kind, predicate, getattr(p, field), lambda node: self.set_node(kind, node, p))
+
+    def set_node(self, kind, node, p):
+        if kind == "location":
+            return Queries.set_location(node, p.country)
+        if kind == "provider":
+            return Queries.set_provider(node, p.provider)
+        if kind == "order":
+            return Queries.set_order(node, p.invoice, p.quantity, p.total, Processor.compute_random_date())
+        return Queries.set_product(node, p.description, p.price)
+
+    def commit(self, rows):
+        # with transactions the progress is only saved once the rows it
+        # covers are committed
+        if self.txn_rows > 0:
+            self.uncommitted += rows
+            if self.uncommitted < self.txn_rows:
+                return
+            self.uncommitted = 0
+            self.commit_transaction()
+        self.checkpoint.commit(self.checkpoint_rows)
+
+    def commit_transaction(self):
+        response = Provider.perform_commit()
+        if response is None:
+            return
+        errors = Processor.extract_errors(response)
+        if errors:
+            raise RuntimeError(f"commit failed: {errors}")
+
+    def send(self, upsert, label):
+        request = upsert.build()
+        if not request:
+            return
+        response = Provider.perform_mutate(request)
+        errors = Processor.extract_errors(response)
+        if errors:
+            raise RuntimeError(f"{label} failed: {errors}")
+        upsert.commit(response)
+
+    def load_concurrently(self, products):
+        rows = [p for p in products if p.description]
+        for p in rows:
+            p.description = p.description.replace("\"", "'")
+        start = time.time()
+
+        # nodes, the key of every node belongs to a single worker so two
+        # workers never create the same node, a kind is finished before the
+        # next one starts
+        for kind, (predicate, field) in KEYS.items():
+            partitions = [{} for _ in range(self.load_workers)]
+            for p in rows:
+                key = getattr(p, field)
+                partitions[self.pool.partition(key)].setdefault(key, p)
+            for index, partition in enumerate(partitions):
+                for chunk in self.chunks(list(partition.values())):
+                    self.pool.submit(index, lambda kind=kind, chunk=chunk: self.load_nodes(kind, chunk), len(chunk))
+            self.pool.wait()
+
+        # relations, the edges of every subject belong to a single worker
+        partitions = [{} for _ in range(self.load_workers)]
+        for p in rows:
+            location = self.cache.peek("location", p.country)
+            provider = self.cache.peek("provider", p.provider)
+            order = self.cache.peek("order", p.invoice)
+            product = self.cache.peek("product", p.description)
+            for subject, predicate, obj in ((provider, "belongs", location), (product, "bought", order), (product, "sold", provider)):
+                if subject and obj:
+                    partitions[self.pool.partition(subject)][(subject, predicate, obj)] = None
+        for index, partition in enumerate(partitions):
+            for chunk in self.chunks(list(partition)):
+                self.pool.submit(index, lambda chunk=chunk: self.load_edges(chunk), len(chunk))
+        self.pool.wait()
+        self.report(len(rows), start)
+
+    def load_nodes(self, kind, chunk):
+        if self.batch_size > 0:
+            upsert = Upsert(self.cache, self.edges)
+            for p in chunk:
+                self.upsert_node(upsert, kind, p)
+            self.send(upsert, f"{kind} chunk")
+        else:
+            for p in chunk:
+                self.resolve_node(kind, p, self.cache.peek("location", p.country))
+        # every chunk is a transaction of the worker that sends it
+        self.commit_transaction()
+
+    def load_edges(self, chunk):
+        if self.batch_size > 0:
+            upsert = Upsert(self.cache, self.edges)
+            for subject, predicate, obj in chunk:
+                upsert.relate(f"<{subject}>", predicate, f"<{obj}>")
+            self.send(upsert, "relation chunk")
+        else:
+            for subject, predicate, obj in chunk:
+                self.link(subject, predicate, obj)
+        self.commit_transaction()
+
+    def chunks(self, items):
+        size = self.batch_size if self.batch_size > 0 else max(self.txn_rows, 1)
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    def report(self, rows, start):
+        elapsed = time.time() - start
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"...{rows} rows loaded in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+
+    def export_graph(self):
+        # the rows are streamed to the file, only the blank node written for
+        # each key is kept in memory
+        self.cache = UIDCache()
+        self.output().makedirs()
+        with open(join(self.export, "graph.schema"), "w") as schema_file:
+            schema_file.write(Queries.get_schema())
+        with self.output().open('w') as out, gzip.GzipFile(fileobj=out, mode="wb") as graph:
+            for file in self.input():
+                with file.open('r') as json_file:
+                    print(f"exporting file {json_file.name}...")
+                    rows = 0
+                    start = time.time()
+                    for p in ResultReader.read(json_file):
+                        if not p.description:
+                            continue
+                        p.description = p.description.replace("\"", "'")
+                        location = self.export_node(graph, "location", p)
+                        provider = self.export_node(graph, "provider", p)
+                        order = self.export_node(graph, "order", p)
+                        product = self.export_node(graph, "product", p)
+                        relations = [(provider, "belongs", location), (product, "bought", order), (product, "sold", provider)]
+                        graph.write(self.nquads(Queries.set_relations(relations)))
+                        rows += 1
+                    self.report(rows, start)
+        print(f"graph exported with {len(self.cache)} nodes to {self.output().path}")
+
+    def export_node(self, graph, kind, p):
+        # blank nodes are named after the kind and a hash of the natural key,
+        # so every export of the same data uses the same names
+        predicate, field = KEYS[kind]
+        key = getattr(p, field)
+        node = self.cache.peek(kind, key)
+        if node is None:
+            digest = hashlib.blake2b(str(key).encode(), digest_size=8).hexdigest()
+            node = f"_:{kind}.{digest}"
+            self.cache.put(kind, key, node)
+            graph.write(self.nquads(self.set_node(kind, node, p)))
+        return node
+
+    def nquads(self, triples):
+        lines = (line.strip() for line in triples.splitlines())
+        return "".join(f"{line}\n" for line in lines if line).encode()
+
+    def complete(self):
+        if self.export:
+            return super().complete() and all(task.complete() for task in self.requires())
+        # the load is outdated once a result file changes after it was loaded
+        if self.full or not super().complete():
+            return False
+        return all(task.complete() for task in self.requires()) and all(LoadCheckpoint.current(file.path) for file in self.input())
+
     def output(self):
+        if self.export:
+            return luigi.LocalTarget(join(self.export, "graph.rdf.gz"), format=luigi.format.Nop)
         return luigi.LocalTarget('result.txt')
 
 
 if __name__ == '__main__':
     retry = True
     while retry:
-        retry = not luigi.run(main_task_cls=Loader, local_scheduler=True, cmdline_args=["--scheduler-retry-count=5", "--scheduler-retry-delay=3", "--scheduler-worker-disconnect-delay=3", "--no-lock"])
+        retry = not luigi.run(main_task_cls=Loader, local_scheduler=True, cmdline_args=["--scheduler-retry-count=5", "--scheduler-retry-delay=3", "--scheduler-worker-disconnect-delay=3", "--no-lock"] + sys.argv[1:])
         time.sleep(10)
@@ -0,0 +1,26 @@
+##!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------
+# Archivo: asset_extractor.py
+# Capitulo: Flujo de Datos
+# Descripción:
+#
+#   Este archivo define el procesador de datos común a los extractores, que
+#   entrega los archivos de la carpeta assets y de sus archivos ZIP
+#   registrados para cada uno
+#-------------------------------------------------------------------------
+import luigi
+from src.helpers.assets import Assets
+from src.readers.zip_reader import ZIPReader
+
+class AssetExtractor(luigi.Task):
+
+    def requires(self):
+        return ZIPReader()
+
+    def complete(self):
+        # the files are ready once the archives they may come from were checked
+        return super().complete() and self.requires().complete()
+
+    def output(self):
+        return Assets.targets(type(self))
\ No newline at end of file
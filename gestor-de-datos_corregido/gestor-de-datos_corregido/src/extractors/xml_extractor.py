@@ -10,21 +10,9 @@
 #   Este archivo define un procesador de datos que se encarga de extraer
 #   el contenido de un archivo XML
 #-------------------------------------------------------------------------
-import luigi, os
-from os.path import isfile, join
-from src.readers.zip_reader import ZIPReader
+from src.extractors.asset_extractor import AssetExtractor
+from src.helpers.assets import Assets
 
-class XMLExtractor(luigi.Task):
-
-    def requires(self):
-        return ZIPReader()
-
-    def output(self):
-        project_dir = os.path.dirname(os.path.abspath("loader.py"))
-        assets_dir = join(project_dir, "assets")
-        files = [f for f in os.listdir(assets_dir) if isfile(join(assets_dir, f))]
-        xml_files = [f for f in files if f.endswith(".xml")]
-        targets = []
-        for file in xml_files:
-            targets.append(luigi.LocalTarget(join(assets_dir, file)))
-        return targets
\ No newline at end of file
+@Assets.register(".xml")
+class XMLExtractor(AssetExtractor):
+    pass
\ No newline at end of file
@@ -0,0 +1,68 @@
+from os.path import join
+import luigi, io, os, zipfile, zlib
+
+class ArchiveMember(luigi.Target):
+
+    # file of a zip archive read straight from it, path is the archive path
+    # followed by the member name so it keeps the name of the member
+
+    def __init__(self, archive, name):
+        self.archive = archive
+        self.name = name
+        self.path = join(archive, name)
+
+    def exists(self):
+        try:
+            with zipfile.ZipFile(self.archive) as archive:
+                archive.getinfo(self.name)
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return False
+        return True
+
+    def open(self, mode='r'):
+        # the member is decompressed as it is read, the archive is closed
+        # once the returned stream is
+        if mode != 'r':
+            raise ValueError(f"archive members can only be read, mode '{mode}' is not supported")
+        with zipfile.ZipFile(self.archive) as archive:
+            return io.TextIOWrapper(archive.open(self.name))
+
+    def describe(self):
+        with zipfile.ZipFile(self.archive) as archive:
+            info = archive.getinfo(self.name)
+        return {"size": info.file_size, "hash": f"{info.CRC:08x}"}
+
+
+class Archives:
+
+    @staticmethod
+    def members(path):
+        # files at the top of the archive, the ones inside folders were never
+        # reached by the extractors
+        with zipfile.ZipFile(path) as archive:
+            return [ArchiveMember(path, info.filename) for info in archive.infolist() if not info.is_dir() and "/" not in info.filename]
+
+    @staticmethod
+    def stamp(paths):
+        # size and modification time of every archive
+        stamps = []
+        for path in paths:
+            stat = os.stat(path)
+            stamps.append((path, stat.st_size, stat.st_mtime_ns))
+        return tuple(stamps)
+
+    @staticmethod
+    def same(member, path, block_size=1024 * 1024):
+        # whether the file holds the content of the member, the sizes are
+        # compared first so a different file is usually not read
+        entry = member.describe()
+        if os.path.getsize(path) != entry["size"]:
+            return False
+        crc = 0
+        with open(path, "rb") as source:
+            while True:
+                block = source.read(block_size)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+        return f"{crc:08x}" == entry["hash"]
\ No newline at end of file
@@ -0,0 +1,70 @@
+from src.helpers.archives import ArchiveMember, Archives
+from os.path import join, splitext
+import luigi, os
+
+class Assets:
+
+    # task that handles the files of each extension
+    handlers = {}
+    # extensions of the files whose members are read as files of the folder
+    ARCHIVES = (".zip",)
+    # last listing of the folder, with the modification times it was read at
+    listing = None
+
+    @staticmethod
+    def register(*extensions):
+        # class decorator, the files with any of the extensions are sent to
+        # the decorated task
+        def decorator(handler):
+            for extension in extensions:
+                Assets.handlers[extension] = handler
+            Assets.listing = None
+            return handler
+        return decorator
+
+    @staticmethod
+    def directory():
+        project_dir = os.path.dirname(os.path.abspath("loader.py"))
+        return join(project_dir, "assets")
+
+    @staticmethod
+    def scan():
+        # the folder is read once and again only after a file is added or
+        # removed, which changes its modification time, or an archive or a
+        # file compared with a member changes, so checking the tasks costs a
+        # stat per archive and member however many files the folder holds
+        directory = Assets.directory()
+        stamp = (directory, os.stat(directory).st_mtime_ns)
+        if Assets.listing is None or Assets.listing[0] != stamp or Assets.listing[1] != Archives.stamp(Assets.listing[2]):
+            files, archives = {}, []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    if splitext(entry.name)[1] in Assets.ARCHIVES:
+                        archives.append(entry.path)
+                    files[entry.name] = luigi.LocalTarget(entry.path)
+            # the members take the place of the files with the same name, as
+            # extracting them used to, unless the file already holds the same
+            # content, a file can be split among processes and extended
+            # while a member is always read whole
+            checked = list(archives)
+            for path in archives:
+                for member in Archives.members(path):
+                    loose = files.get(member.name)
+                    if loose is not None and not isinstance(loose, ArchiveMember):
+                        checked.append(loose.path)
+                        if Archives.same(member, loose.path):
+                            continue
+                    files[member.name] = member
+            routes = {}
+            for name, target in files.items():
+                handler = Assets.handlers.get(splitext(name)[1])
+                if handler is not None:
+                    routes.setdefault(handler, []).append(target)
+            Assets.listing = (stamp, Archives.stamp(checked), checked, routes)
+        return Assets.listing[3]
+
+    @staticmethod
+    def targets(handler):
+        return list(Assets.scan().get(handler, []))
\ No newline at end of file
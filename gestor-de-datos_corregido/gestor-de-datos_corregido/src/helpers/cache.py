@@ -0,0 +1,84 @@
+import threading
+
+class UIDCache:
+
+    def __init__(self):
+        self.uids = {}
+        self.complete = set()
+        self.hits = 0
+        self.misses = 0
+        # the cache is shared by the loader workers
+        self.lock = threading.Lock()
+
+    def get(self, kind, key):
+        uid = self.uids.get((kind, key))
+        with self.lock:
+            if uid is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return uid
+
+    def peek(self, kind, key):
+        # lookup that is not counted as a hit or a miss
+        return self.uids.get((kind, key))
+
+    def put(self, kind, key, uid):
+        if uid:
+            self.uids[(kind, key)] = uid
+
+    def warm(self, kind, key, uid):
+        # keeps the first uid when the graph already has duplicated keys
+        if uid and not (kind, key) in self.uids:
+            self.uids[(kind, key)] = uid
+
+    def mark_complete(self, kind):
+        # every existing node of this kind is cached, a miss means the
+        # node does not exist in the graph
+        self.complete.add(kind)
+
+    def is_complete(self, kind):
+        return kind in self.complete
+
+    def __len__(self):
+        return len(self.uids)
+
+    def stats(self):
+        return f"{len(self.uids)} uids cached, {self.hits} hits, {self.misses} misses"
+
+
+class EdgeSet:
+
+    def __init__(self):
+        self.edges = set()
+        # (subject, predicate) pairs whose edges are all in the set
+        self.loaded = set()
+        # predicates whose edges are all in the set
+        self.complete = set()
+        # nodes created during the run, they start without edges
+        self.created = set()
+
+    def is_loaded(self, subject, predicate):
+        return (predicate in self.complete
+            or subject in self.created
+            or (subject, predicate) in self.loaded)
+
+    def load(self, subject, predicate, objects):
+        self.loaded.add((subject, predicate))
+        for obj in objects:
+            self.edges.add((subject, predicate, obj))
+
+    def track(self, subject):
+        self.created.add(subject)
+
+    def mark_complete(self, predicate):
+        self.complete.add(predicate)
+
+    def add(self, subject, predicate, obj):
+        self.edges.add((subject, predicate, obj))
+
+    def __contains__(self, edge):
+        return edge in self.edges
+
+    def __len__(self):
+        return len(self.edges)
\ No newline at end of file
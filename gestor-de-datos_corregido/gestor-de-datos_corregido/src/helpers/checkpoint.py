@@ -0,0 +1,111 @@
+from src.helpers.record import Record
+import hashlib, json, os
+
+class LoadCheckpoint:
+
+    # bytes kept per record fingerprint
+    DIGEST_SIZE = 16
+    # fields in the order they are fingerprinted, sorted by name like the
+    # keys of the dicts earlier runs fingerprinted so their checkpoints hold
+    FIELDS = sorted(Record.FIELDS)
+
+    def __init__(self, path, loaded=()):
+        self.path = path
+        stat = os.stat(path)
+        self.stamp = {"size": stat.st_size, "mtime": stat.st_mtime}
+        # fingerprints of the records loaded by the last successful run and of
+        # the records seen by this one
+        self.loaded = set(loaded)
+        self.seen = set()
+        self.skipped = 0
+        # records of the file read so far and the ones a failed run already
+        # sent, with the id of its last sent chunk
+        self.rows = 0
+        self.offset = 0
+        self.chunk = 0
+        self.saved = 0
+
+    @staticmethod
+    def file(path):
+        return f"{path}.loaded"
+
+    @staticmethod
+    def progress(path):
+        return f"{path}.progress"
+
+    @staticmethod
+    def read(path, full=False):
+        # checkpoint of the result file, empty when it was never loaded or a
+        # full load is requested, a run that failed on this same file resumes
+        # after its last saved row either way
+        loaded = []
+        if not full:
+            try:
+                with open(LoadCheckpoint.file(path), "rb") as checkpoint_file:
+                    checkpoint_file.readline()
+                    data = checkpoint_file.read()
+                size = LoadCheckpoint.DIGEST_SIZE
+                loaded = [data[i:i + size] for i in range(0, len(data), size)]
+            except OSError:
+                pass
+        checkpoint = LoadCheckpoint(path, loaded)
+        try:
+            with open(LoadCheckpoint.progress(path)) as progress_file:
+                progress = json.load(progress_file)
+        except (OSError, ValueError):
+            return checkpoint
+        if progress["stamp"] == checkpoint.stamp:
+            checkpoint.offset = checkpoint.saved = progress["rows"]
+            checkpoint.chunk = progress["chunk"]
+        return checkpoint
+
+    @staticmethod
+    def current(path):
+        # whether the result file was loaded as it is now
+        try:
+            with open(LoadCheckpoint.file(path), "rb") as checkpoint_file:
+                stamp = json.loads(checkpoint_file.readline())
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return False
+        return stamp == {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    @staticmethod
+    def fingerprint(record):
+        text = "\x1f".join(f"{key}={getattr(record, key)}" for key in LoadCheckpoint.FIELDS)
+        return hashlib.blake2b(text.encode(), digest_size=LoadCheckpoint.DIGEST_SIZE).digest()
+
+    def new(self, records):
+        # yields only the records that are new or changed since the last run
+        for record in records:
+            fingerprint = LoadCheckpoint.fingerprint(record)
+            self.seen.add(fingerprint)
+            self.rows += 1
+            if self.rows <= self.offset or fingerprint in self.loaded:
+                self.skipped += 1
+            else:
+                yield record
+
+    def commit(self, every):
+        # called once the records yielded so far were sent, the progress is
+        # saved every given number of rows
+        self.chunk += 1
+        if every > 0 and self.rows - self.saved >= every:
+            progress = {"stamp": self.stamp, "rows": self.rows, "chunk": self.chunk}
+            temp = f"{LoadCheckpoint.progress(self.path)}.tmp"
+            with open(temp, "w") as progress_file:
+                json.dump(progress, progress_file)
+            os.replace(temp, LoadCheckpoint.progress(self.path))
+            self.saved = self.rows
+
+    def save(self):
+        # called once every record of the file was loaded, the records that
+        # are no longer in the file are dropped from the checkpoint
+        temp = f"{LoadCheckpoint.file(self.path)}.tmp"
+        with open(temp, "wb") as checkpoint_file:
+            checkpoint_file.write(json.dumps(self.stamp).encode() + b"\n")
+            for fingerprint in self.seen:
+                checkpoint_file.write(fingerprint)
+        os.replace(temp, LoadCheckpoint.file(self.path))
+        if os.path.exists(LoadCheckpoint.progress(self.path)):
+            os.remove(LoadCheckpoint.progress(self.path))
\ No newline at end of file
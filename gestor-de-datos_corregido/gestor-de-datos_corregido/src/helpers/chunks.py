@@ -0,0 +1,132 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from src.helpers.archives import ArchiveMember
+import luigi, io, mmap, os, re
+
+class TransformConfig(luigi.Config):
+
+    # processes used to transform one source file, 1 keeps the serial run
+    processes = luigi.IntParameter(default=1)
+    # approximate size in bytes of the pieces a source file is cut into
+    chunk_size = luigi.IntParameter(default=4 * 1024 * 1024)
+    # engine used for the CSV rows, pandas reads them in blocks and computes
+    # every total of a block at once (requires pandas)
+    engine = luigi.ChoiceParameter(choices=["python", "pandas"], default="python")
+
+
+class FileChunks:
+
+    @staticmethod
+    def sources(files, function, delimiter=None, quote=None, body=None, offsets=None):
+        # yields the records of every file in order, with several processes
+        # the archive members are decompressed at once, one task per member,
+        # loose files are cut into pieces as records does or, without a
+        # delimiter, read whole
+        config = TransformConfig()
+        members = deque(file for file in files if isinstance(file, ArchiveMember))
+        if config.processes <= 1 or len(members) < 2:
+            for file in files:
+                yield from FileChunks.loose(file, function, delimiter, quote, body, offsets)
+            return
+        with ProcessPoolExecutor(config.processes) as pool:
+            # members are submitted in file order, at most one per process
+            # waits to be written
+            pending = deque()
+            for file in files:
+                if not isinstance(file, ArchiveMember):
+                    yield from FileChunks.loose(file, function, delimiter, quote, body, offsets)
+                    continue
+                while members and len(pending) < config.processes:
+                    member = members.popleft()
+                    pending.append(pool.submit(FileChunks.member, function, member.archive, member.name))
+                yield from pending.popleft().result()
+
+    @staticmethod
+    def loose(file, function, delimiter, quote, body, offsets):
+        if delimiter is None:
+            with file.open() as source:
+                yield from function(source)
+            return
+        start = offsets[file.path] if offsets else None
+        yield from FileChunks.records(file, function, delimiter, quote, body, start)
+
+    @staticmethod
+    def records(file, function, delimiter, quote=None, body=None, start=None):
+        # yields the records produced by function for the whole file, or from
+        # the start offset on, in the same order as a serial run, function
+        # receives an open text file, archive members are read as a stream
+        config = TransformConfig()
+        if isinstance(file, ArchiveMember) or start is None and (config.processes <= 1 or os.path.getsize(file.path) <= config.chunk_size):
+            with file.open() as source:
+                yield from function(source)
+            return
+        head, tail, ranges = FileChunks.split(file.path, delimiter, config.chunk_size, quote, body, start)
+        if config.processes <= 1:
+            for begin, end in ranges:
+                yield from FileChunks.transform(function, file.path, begin, end, head, tail)
+            return
+        with ProcessPoolExecutor(config.processes) as pool:
+            # at most two pieces per process wait to be written
+            pending = deque()
+            for begin, end in ranges:
+                pending.append(pool.submit(FileChunks.transform, function, file.path, begin, end, head, tail))
+                if len(pending) >= 2 * config.processes:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    @staticmethod
+    def split(path, delimiter, chunk_size, quote=None, body=None, start=None):
+        # the records lie between the header line and the end of the file or,
+        # when body holds an opening and a closing tag, between the first
+        # opening and the last closing tag, what lies around them is returned
+        # as head and tail so every piece can be read as a smaller copy of the
+        # file, start skips the records before that offset
+        delimiter = re.compile(delimiter)
+        with open(path, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if body is None:
+                first, end = data.find(b"\n") + 1, len(data)
+            else:
+                first, end = data.find(body[0]), data.rfind(body[1]) + len(body[1])
+            ranges = []
+            begin = first if start is None else start
+            while end - begin > chunk_size:
+                cut = FileChunks.cut(data, begin, begin + chunk_size, end, delimiter, quote)
+                if cut is None or cut >= end:
+                    break
+                ranges.append((begin, cut))
+                begin = cut
+            if begin < end:
+                ranges.append((begin, end))
+            return data[:first], data[end:], ranges
+
+    @staticmethod
+    def cut(data, begin, offset, end, delimiter, quote=None):
+        # first position after offset that follows a delimiter which is not
+        # inside a quoted field
+        inside = quote is not None and data[begin:offset].count(quote) % 2 == 1
+        position = offset
+        while True:
+            match = delimiter.search(data, position, end)
+            if match is None:
+                return None
+            if quote is not None and data[position:match.start()].count(quote) % 2 == 1:
+                inside = not inside
+            if not inside:
+                return match.end()
+            position = match.end()
+
+    @staticmethod
+    def transform(function, path, begin, end, head, tail):
+        # runs inside a pool process, the piece is decoded the same way
+        # luigi decodes the whole file
+        with open(path, "rb") as source:
+            source.seek(begin)
+            data = source.read(end - begin)
+        return list(function(io.TextIOWrapper(io.BytesIO(head + data + tail))))
+
+    @staticmethod
+    def member(function, archive, name):
+        # runs inside a pool process, the member is decompressed there
+        with ArchiveMember(archive, name).open() as source:
+            return list(function(source))
\ No newline at end of file
@@ -0,0 +1,26 @@
+from src.helpers.record import Record
+
+class Frames:
+
+    # rows read and transformed at once by the vectorized engine
+    BLOCK_ROWS = 100000
+
+    @staticmethod
+    def load():
+        try:
+            import pandas
+        except ImportError:
+            raise RuntimeError("the pandas transform engine requires pandas, install it with: pip install pandas")
+        return pandas
+
+    @staticmethod
+    def total(quantity, price):
+        # the values are kept as python strings and converted the same way
+        # float() does, so every total matches the row by row engine
+        return (quantity.astype(float) * price.astype(float)).tolist()
+
+    @staticmethod
+    def records(description, quantity, price, total, invoice, provider, country):
+        # builds the records of a whole block from its columns
+        columns = [c if isinstance(c, list) else c.tolist() for c in (description, quantity, price, total, invoice, provider, country)]
+        yield from map(Record, *columns)
\ No newline at end of file
@@ -0,0 +1,78 @@
+from html.parser import HTMLParser
+
+class TableParser(HTMLParser):
+
+    def __init__(self, css_class):
+        super().__init__()
+        self.css_class = css_class
+        # depth of the tables opened inside the wanted table, 0 outside of it
+        self.depth = 0
+        self.done = False
+        self.row = None
+        self.cell = None
+        self.rows = []
+
+    @staticmethod
+    def read(file, css_class, chunk_size=65536):
+        # yields the rows of the first table with the given class as a list
+        # of (tag, text) cells while the file is being read
+        parser = TableParser(css_class)
+        while not parser.done:
+            chunk = file.read(chunk_size)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+                parser.end_row()
+                parser.done = True
+            yield from parser.rows
+            parser.rows = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            if self.depth > 0:
+                self.depth += 1
+            elif self.css_class in (dict(attrs).get("class") or "").split():
+                self.depth = 1
+            return
+        if self.depth == 0:
+            return
+        if tag == "tr":
+            self.end_row()
+            self.row = []
+        elif tag in ("td", "th"):
+            self.end_cell()
+            if self.row is None:
+                self.row = []
+            self.cell = (tag, [])
+
+    def handle_endtag(self, tag):
+        if self.done or self.depth == 0:
+            return
+        if tag == "table":
+            self.depth -= 1
+            if self.depth == 0:
+                self.end_row()
+                self.done = True
+        elif tag == "tr":
+            self.end_row()
+        elif tag in ("td", "th"):
+            self.end_cell()
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell[1].append(data)
+
+    def end_cell(self):
+        if self.cell is not None:
+            tag, text = self.cell
+            self.row.append((tag, "".join(text)))
+            self.cell = None
+
+    def end_row(self):
+        self.end_cell()
+        if self.row is not None:
+            self.rows.append(self.row)
+            self.row = None
\ No newline at end of file
@@ -0,0 +1,111 @@
+from src.helpers.archives import ArchiveMember
+import hashlib, json, os, re
+
+class Manifest:
+
+    @staticmethod
+    def path(target):
+        return f"{target.path}.manifest"
+
+    @staticmethod
+    def read(target):
+        try:
+            with open(Manifest.path(target)) as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def write(target, sources):
+        # records the sources the output was built from, once the output is
+        # complete
+        manifest = {
+            "output": os.path.getsize(target.path),
+            "sources": {os.path.basename(source.path): Manifest.describe(source) for source in sources}
+        }
+        with open(Manifest.path(target), "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
+
+    @staticmethod
+    def describe(source):
+        # archive members are described by their size and CRC
+        if isinstance(source, ArchiveMember):
+            return source.describe()
+        stat = os.stat(source.path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime, "hash": Manifest.hash(source.path, stat.st_size)}
+
+    @staticmethod
+    def hash(path, size, block_size=1024 * 1024):
+        # hash of the first size bytes of the file
+        digest = hashlib.sha256()
+        with open(path, "rb") as source:
+            while size > 0:
+                block = source.read(min(block_size, size))
+                if not block:
+                    break
+                digest.update(block)
+                size -= len(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def status(source, entry):
+        # "unchanged", "appended" when the recorded content is still at the
+        # start of the file, or "changed"
+        if isinstance(source, ArchiveMember):
+            return "unchanged" if source.describe() == entry else "changed"
+        path = source.path
+        stat = os.stat(path)
+        if stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]:
+            return "unchanged"
+        if stat.st_size < entry["size"] or Manifest.hash(path, entry["size"]) != entry["hash"]:
+            return "changed"
+        return "unchanged" if stat.st_size == entry["size"] else "appended"
+
+    @staticmethod
+    def sources(target, sources):
+        # status of every source against the manifest, None when the output
+        # was built from other files or has no manifest
+        manifest = Manifest.read(target)
+        names = {os.path.basename(source.path): source for source in sources}
+        if manifest is None or set(manifest["sources"]) != set(names):
+            return None
+        return {source.path: Manifest.status(source, manifest["sources"][name]) for name, source in names.items()}
+
+    @staticmethod
+    def unchanged(target, sources):
+        status = Manifest.sources(target, sources)
+        return status is not None and all(s == "unchanged" for s in status.values())
+
+    @staticmethod
+    def appended(target, sources, delimiter):
+        # offsets where each source has to be read from when the output can
+        # be extended instead of rebuilt, which needs a record per line in the
+        # output and sources that only grew after a complete record, archive
+        # members are always read whole
+        if not target.path.endswith(".ndjson") or not target.exists():
+            return None
+        if any(isinstance(source, ArchiveMember) for source in sources):
+            return None
+        manifest = Manifest.read(target)
+        status = Manifest.sources(target, sources)
+        if status is None or "changed" in status.values() or os.path.getsize(target.path) < manifest["output"]:
+            return None
+        offsets = {}
+        for source in sources:
+            size = manifest["sources"][os.path.basename(source.path)]["size"]
+            with open(source.path, "rb") as source_file:
+                source_file.seek(max(size - 1, 0))
+                if size == 0 or not re.fullmatch(delimiter, source_file.read(1)):
+                    return None
+            offsets[source.path] = size
+        return offsets
+
+    @staticmethod
+    def open(target, offsets):
+        # the output is extended from where the last complete run left it, so
+        # the rows of an interrupted run are written only once
+        if offsets is None:
+            return target.open('w')
+        out = open(target.path, "a")
+        out.truncate(Manifest.read(target)["output"])
+        return out
\ No newline at end of file
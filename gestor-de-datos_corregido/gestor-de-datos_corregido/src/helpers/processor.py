@@ -62,6 +62,80 @@ class Processor:
             return [rel["uid"] for rel in relations]
         return []
 
+    @staticmethod
+    def extract_upsert_uids(res):
+        assert isinstance(res, requests.Response)
+
+        if res.status_code == 200:
+            response = json.loads(res.text)
+
+            if not 'data' in response.keys():
+                return {}
+
+            uids = {}
+            # existing nodes come back in the q_<var> query blocks
+            for block, nodes in response["data"].get("queries", {}).items():
+                if len(nodes) > 0:
+                    uids[block[len("q_"):]] = nodes[0]["uid"]
+
+            # created nodes come back as uid(<var>) or as the blank node name
+            for name, uid in response["data"].get("uids", {}).items():
+                if name.startswith("uid("):
+                    name = name[len("uid("):-len(")")]
+                uids[name] = uid
+            return uids
+        return {}
+
+    @staticmethod
+    def extract_keys(res, predicate):
+        # None when the page could not be read, so a failed page is never
+        # taken for an empty last page
+        assert isinstance(res, requests.Response)
+
+        if res.status_code == 200:
+            response = json.loads(res.text)
+
+            if not isinstance(response.get("data"), dict):
+                return None
+
+            if not 'response' in response["data"].keys():
+                return None
+
+            return [(node[predicate], node["uid"]) for node in response["data"]["response"]]
+        return None
+
+    @staticmethod
+    def extract_edges(res, predicate):
+        # None when the page could not be read, so a failed page is never
+        # taken for an empty last page
+        assert isinstance(res, requests.Response)
+
+        if res.status_code == 200:
+            response = json.loads(res.text)
+
+            if not isinstance(response.get("data"), dict):
+                return None
+
+            if not 'response' in response["data"].keys():
+                return None
+
+            return [(node["uid"], [rel["uid"] for rel in node[predicate]]) for node in response["data"]["response"]]
+        return None
+
+    @staticmethod
+    def extract_errors(res):
+        assert isinstance(res, requests.Response)
+
+        if res.status_code != 200:
+            return [res.text]
+
+        response = json.loads(res.text)
+
+        if not 'errors' in response.keys():
+            return []
+
+        return [error["message"] for error in response["errors"]]
+
     @staticmethod
     def compute_random_date():
         end_date = date.today()
@@ -1,16 +1,73 @@
-import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import requests, threading, json
 
 host = "http://localhost"
 port = "8080"
 
 class Provider:
 
+    session = None
+    timeout = 60
+    # with transactions every thread sends its mutations in a transaction that
+    # stays open until it commits, otherwise each mutation commits on its own
+    transactions = False
+    local = threading.local()
+
+    @staticmethod
+    def configure(pool_size=10, timeout=60, retries=3, transactions=False):
+        # only failed connections and unavailable responses are retried, a
+        # request that may have reached Dgraph is never sent twice
+        retry = Retry(total=retries, connect=retries, read=0, status=retries,
+            status_forcelist=[502, 503, 504], allowed_methods=False, backoff_factor=0.5)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if Provider.session is not None:
+            Provider.session.close()
+        Provider.session = session
+        Provider.timeout = timeout
+        Provider.transactions = transactions
+        Provider.local = threading.local()
+
+    @staticmethod
+    def get_session():
+        if Provider.session is None:
+            Provider.configure()
+        return Provider.session
+
+    @staticmethod
+    def transaction():
+        # transaction of the calling thread, Dgraph starts it with the first
+        # mutation and returns its start timestamp
+        if not Provider.transactions:
+            return None
+        txn = getattr(Provider.local, "txn", None)
+        if txn is None:
+            txn = Provider.local.txn = {"start_ts": 0, "keys": set(), "preds": set()}
+        return txn
+
     @staticmethod
     def perform_mutate(data):
         headers = {
             "Content-Type": "application/rdf"
         }
-        response = requests.post(f"{host}:{port}/mutate?commitNow=true", data=data, headers=headers)
+        txn = Provider.transaction()
+        if txn is None:
+            url = f"{host}:{port}/mutate?commitNow=true"
+        elif txn["start_ts"]:
+            url = f"{host}:{port}/mutate?startTs={txn['start_ts']}"
+        else:
+            url = f"{host}:{port}/mutate"
+        response = Provider.get_session().post(url, data=data, headers=headers, timeout=Provider.timeout)
+        if txn is not None and response.status_code == 200:
+            # the keys and predicates written are needed to commit
+            context = response.json().get("extensions", {}).get("txn", {})
+            txn["start_ts"] = context.get("start_ts", txn["start_ts"])
+            txn["keys"].update(context.get("keys", []))
+            txn["preds"].update(context.get("preds", []))
         return response
 
     @staticmethod
@@ -18,7 +75,28 @@ class Provider:
         headers = {
             "Content-Type": "application/dql"
         }
-        response = requests.post(f"{host}:{port}/query", data=data, headers=headers)
+        # queries inside a transaction see its uncommitted mutations
+        txn = Provider.transaction()
+        url = f"{host}:{port}/query"
+        if txn is not None and txn["start_ts"]:
+            url = f"{url}?startTs={txn['start_ts']}"
+        response = Provider.get_session().post(url, data=data, headers=headers, timeout=Provider.timeout)
+        return response
+
+    @staticmethod
+    def perform_commit():
+        # commits every mutation the calling thread sent since its last
+        # commit, returns None when there was nothing to commit
+        txn = getattr(Provider.local, "txn", None)
+        Provider.local.txn = None
+        if txn is None or not txn["start_ts"]:
+            return None
+        headers = {
+            "Content-Type": "application/json"
+        }
+        url = f"{host}:{port}/commit?startTs={txn['start_ts']}"
+        data = json.dumps({"keys": sorted(txn["keys"]), "preds": sorted(txn["preds"])})
+        response = Provider.get_session().post(url, data=data, headers=headers, timeout=Provider.timeout)
         return response
 
     @staticmethod
@@ -26,5 +104,5 @@ class Provider:
         headers = {
             "Content-Type": "text/plain"
         }
-        response = requests.post(f"{host}:{port}/alter", data=data, headers=headers)
+        response = Provider.get_session().post(f"{host}:{port}/alter", data=data, headers=headers, timeout=Provider.timeout)
         return response
\ No newline at end of file
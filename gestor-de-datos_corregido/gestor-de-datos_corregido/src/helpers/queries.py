@@ -203,4 +203,107 @@ class Queries:
                     _:location <dgraph.type> "Location" .
                 }
             }
-        """ % (name)
\ No newline at end of file
+        """ % (name)
+
+    @staticmethod
+    def query_var(var, predicate, value):
+        return """
+                q_%s(func: eq(%s, "%s"), first: 1) {
+                    %s as uid
+                }
+        """ % (var, predicate, value, var)
+
+    @staticmethod
+    def set_location(node, name):
+        return """
+                    %s <name> "%s" .
+                    %s <dgraph.type> "Location" .
+        """ % (node, name, node)
+
+    @staticmethod
+    def set_provider(node, pid):
+        return """
+                    %s <pid> "%s" .
+                    %s <dgraph.type> "Provider" .
+        """ % (node, pid, node)
+
+    @staticmethod
+    def set_order(node, inv, qty, tot, date):
+        return """
+                    %s <invoice> "%s" .
+                    %s <quantity> "%s" .
+                    %s <total> "%s" .
+                    %s <date> "%s" .
+                    %s <dgraph.type> "Order" .
+        """ % (node, inv, node, qty, node, tot, node, date, node)
+
+    @staticmethod
+    def set_product(node, desc, price):
+        return """
+                    %s <description> "%s" .
+                    %s <price> "%s" .
+                    %s <dgraph.type> "Product" .
+        """ % (node, desc, node, price, node)
+
+    @staticmethod
+    def set_relations(relations):
+        return "".join("""
+                    %s <%s> %s .
+        """ % relation for relation in relations)
+
+    @staticmethod
+    def mutation(triples, var=None):
+        # with a variable the mutation only runs when the variable is empty
+        condition = "@if(eq(len(%s), 0)) " % (var) if var else ""
+        return """
+            mutation %s{
+                set {
+                    %s
+                }
+            }
+        """ % (condition, triples)
+
+    @staticmethod
+    def set_triples(triples):
+        return """
+            {
+                set {
+                    %s
+                }
+            }
+        """ % (triples)
+
+    @staticmethod
+    def query_keys(predicate, first, after):
+        return """
+            {
+                response(func: has(%s), first: %s, after: %s) {
+                    uid
+                    %s
+                }
+            }
+        """ % (predicate, first, after, predicate)
+
+    @staticmethod
+    def query_edges(predicate, first, after):
+        return """
+            {
+                response(func: has(%s), first: %s, after: %s) {
+                    uid
+                    %s {
+                        uid
+                    }
+                }
+            }
+        """ % (predicate, first, after, predicate)
+
+    @staticmethod
+    def upsert(queries, mutations):
+        return """
+            upsert {
+                query {
+                    %s
+                }
+                %s
+            }
+        """ % ("".join(queries), "".join(mutations))
\ No newline at end of file
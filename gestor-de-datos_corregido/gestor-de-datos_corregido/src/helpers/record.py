@@ -0,0 +1,36 @@
+class Record:
+
+    # fields of every row, in the order the result files keep them
+    FIELDS = ("description", "quantity", "price", "total", "invoice", "provider", "country")
+
+    # the fields are kept in fixed slots instead of a dict per row
+    __slots__ = FIELDS
+
+    def __init__(self, description, quantity, price, total, invoice, provider, country):
+        self.description = description
+        self.quantity = quantity
+        self.price = price
+        self.total = total
+        self.invoice = invoice
+        self.provider = provider
+        self.country = country
+
+    @staticmethod
+    def from_dict(values):
+        return Record(*(values[field] for field in Record.FIELDS))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in Record.FIELDS}
+
+    def values(self):
+        return tuple(getattr(self, field) for field in Record.FIELDS)
+
+    def __eq__(self, other):
+        return isinstance(other, Record) and self.values() == other.values()
+
+    def __reduce__(self):
+        # records sent between processes are pickled as a plain tuple
+        return Record, self.values()
+
+    def __repr__(self):
+        return f"Record{self.values()}"
\ No newline at end of file
@@ -0,0 +1,122 @@
+from src.helpers.record import Record
+from os.path import join
+import luigi, json
+
+class ResultConfig(luigi.Config):
+
+    # format of the files written by the transformers and read by the loader,
+    # json keeps one indented list per file, ndjson one record per line and
+    # arrow typed columns in an Arrow IPC stream (requires pyarrow)
+    format = luigi.ChoiceParameter(choices=["json", "ndjson", "arrow"], default="json")
+
+    @staticmethod
+    def target(result_dir, name):
+        format = ResultConfig().format
+        path = join(result_dir, f"{name}.{format}")
+        if format == "arrow":
+            return luigi.LocalTarget(path, format=luigi.format.Nop)
+        return luigi.LocalTarget(path)
+
+
+class ArrowResults:
+
+    @staticmethod
+    def load():
+        try:
+            import pyarrow
+            import pyarrow.ipc
+        except ImportError:
+            raise RuntimeError("the arrow result format requires pyarrow, install it with: pip install pyarrow")
+        return pyarrow
+
+    @staticmethod
+    def schema():
+        pa = ArrowResults.load()
+        return pa.schema([
+            ("description", pa.string()),
+            ("quantity", pa.int64()),
+            ("price", pa.float64()),
+            ("total", pa.float64()),
+            ("invoice", pa.string()),
+            ("provider", pa.dictionary(pa.int32(), pa.string())),
+            ("country", pa.dictionary(pa.int32(), pa.string()))
+        ])
+
+    @staticmethod
+    def to_batch(records):
+        pa = ArrowResults.load()
+        return pa.record_batch([
+            pa.array([r.description for r in records], pa.string()),
+            pa.array([int(r.quantity) for r in records], pa.int64()),
+            pa.array([float(r.price) for r in records], pa.float64()),
+            pa.array([float(r.total) for r in records], pa.float64()),
+            pa.array([r.invoice for r in records], pa.string()),
+            pa.array([r.provider for r in records], pa.string()).dictionary_encode(),
+            pa.array([r.country for r in records], pa.string()).dictionary_encode()
+        ], schema=ArrowResults.schema())
+
+    @staticmethod
+    def read(path):
+        # the file is memory mapped, only the batch being read is decoded
+        pa = ArrowResults.load()
+        with pa.memory_map(path) as source:
+            for batch in pa.ipc.open_stream(source):
+                yield from map(Record, *(column.to_pylist() for column in batch.columns))
+
+    @staticmethod
+    def scan(path, column):
+        # yields the arrays of one column straight from the mapped file
+        pa = ArrowResults.load()
+        with pa.memory_map(path) as source:
+            for batch in pa.ipc.open_stream(source):
+                yield batch.column(column)
+
+
+class ResultWriter:
+
+    def __init__(self, out, format=None, batch_rows=65536):
+        self.out = out
+        self.format = format or ResultConfig().format
+        self.batch_rows = batch_rows
+        self.records = []
+        self.stream = None
+
+    def write(self, record):
+        if self.format == "ndjson":
+            self.out.write(json.dumps(record.to_dict(), separators=(",", ":")) + "\n")
+        else:
+            self.records.append(record)
+            if self.format == "arrow" and len(self.records) == self.batch_rows:
+                self.flush()
+
+    def flush(self):
+        # each arrow batch carries its own dictionaries, the stream format
+        # allows them to change between batches
+        if self.stream is None:
+            pa = ArrowResults.load()
+            self.stream = pa.ipc.new_stream(self.out, ArrowResults.schema())
+        self.stream.write_batch(ArrowResults.to_batch(self.records))
+        self.records = []
+
+    def close(self):
+        if self.format == "json":
+            self.out.write(json.dumps(self.records, indent=4, default=Record.to_dict))
+        elif self.format == "arrow":
+            if self.records or self.stream is None:
+                self.flush()
+            self.stream.close()
+
+
+class ResultReader:
+
+    @staticmethod
+    def read(file):
+        # ndjson and arrow files are read one record at a time
+        if file.name.endswith(".arrow"):
+            yield from ArrowResults.read(file.name)
+        elif file.name.endswith(".ndjson"):
+            for line in file:
+                if line.strip():
+                    yield Record.from_dict(json.loads(line))
+        else:
+            yield from map(Record.from_dict, json.load(file))
\ No newline at end of file
@@ -0,0 +1,66 @@
+from src.helpers.queries import Queries
+from src.helpers.processor import Processor
+
+class Upsert:
+
+    def __init__(self, cache, edges):
+        self.cache = cache
+        self.edges = edges
+        self.queries = []
+        self.mutations = []
+        self.triples = []
+        self.relations = {}
+        self.variables = {}
+
+    def node(self, kind, predicate, key, create):
+        # one node reference per distinct entity that is not cached yet, the
+        # first call for an entity defines its attributes
+        if not (kind, key) in self.variables:
+            uid = self.cache.get(kind, key)
+            if uid:
+                return f"<{uid}>"
+            name = f"{kind}{len(self.variables)}"
+            self.variables[(kind, key)] = name
+            if self.cache.is_complete(kind):
+                # the node is known to be missing, no query is needed
+                self.triples.append(create(f"_:{name}"))
+            else:
+                self.queries.append(Queries.query_var(name, predicate, key))
+                self.mutations.append(Queries.mutation(create(f"uid({name})"), name))
+        name = self.variables[(kind, key)]
+        return f"_:{name}" if self.cache.is_complete(kind) else f"uid({name})"
+
+    def relate(self, subject, predicate, obj):
+        # only edges between cached nodes can already be known
+        if not (self.node_uid(subject, {}), predicate, self.node_uid(obj, {})) in self.edges:
+            self.relations[(subject, predicate, obj)] = None
+
+    def build(self):
+        triples = list(self.triples)
+        if self.relations:
+            triples.append(Queries.set_relations(self.relations))
+        if not triples and not self.mutations:
+            return None
+        if not self.queries:
+            return Queries.set_triples("".join(triples))
+        mutations = list(self.mutations)
+        if triples:
+            mutations.append(Queries.mutation("".join(triples)))
+        return Queries.upsert(self.queries, mutations)
+
+    def commit(self, response):
+        # records the uids and edges of a successful upsert
+        uids = Processor.extract_upsert_uids(response)
+        for (kind, key), name in self.variables.items():
+            self.cache.put(kind, key, uids.get(name))
+        for subject, predicate, obj in self.relations:
+            self.edges.add(self.node_uid(subject, uids), predicate, self.node_uid(obj, uids))
+
+    @staticmethod
+    def node_uid(node, uids):
+        # maps a node reference of an upsert to the uid of the node
+        if node.startswith("<"):
+            return node[1:-1]
+        if node.startswith("_:"):
+            return uids.get(node[2:])
+        return uids.get(node[len("uid("):-len(")")])
\ No newline at end of file
@@ -0,0 +1,61 @@
+from zlib import crc32
+import queue, threading, time
+
+class WorkerPool:
+
+    def __init__(self, workers, capacity=1000):
+        self.queues = [queue.Queue(maxsize=capacity) for _ in range(workers)]
+        self.items = [0] * workers
+        self.busy = [0.0] * workers
+        self.depth = [0] * workers
+        self.errors = []
+        self.threads = [threading.Thread(target=self.work, args=(index,), daemon=True) for index in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def partition(self, key):
+        # the same key always goes to the same worker
+        return crc32(str(key).encode("utf-8")) % len(self.queues)
+
+    def submit(self, index, task, size=1):
+        self.queues[index].put((task, size))
+        self.depth[index] = max(self.depth[index], self.queues[index].qsize())
+
+    def work(self, index):
+        while True:
+            item = self.queues[index].get()
+            if item is None:
+                self.queues[index].task_done()
+                return
+            task, size = item
+            start = time.time()
+            try:
+                # after a failure the remaining tasks are discarded
+                if not self.errors:
+                    task()
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.busy[index] += time.time() - start
+                self.items[index] += size
+                self.queues[index].task_done()
+
+    def wait(self):
+        for q in self.queues:
+            q.join()
+        if self.errors:
+            raise self.errors[0]
+
+    def close(self):
+        for q in self.queues:
+            q.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def report(self):
+        lines = []
+        for index in range(len(self.queues)):
+            rate = self.items[index] / self.busy[index] if self.busy[index] > 0 else 0
+            lines.append(f"worker {index}: {self.items[index]} items in {self.busy[index]:.2f}s "
+                f"({rate:.0f} items/sec), max queue depth {self.depth[index]}")
+        return lines
\ No newline at end of file
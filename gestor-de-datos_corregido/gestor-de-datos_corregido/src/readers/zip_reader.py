@@ -7,24 +7,62 @@
 # Version: 1.0.0 Noviembre 2022
 # Descripción:
 #
-#   Este archivo define un procesador de datos que se encarga de leer y
-#   descomprimir el contenido de un archivo ZIP
+#   Este archivo define un procesador de datos que se encarga de leer el
+#   contenido de los archivos ZIP, cuyos archivos se leen directamente
+#   desde el archivo ZIP sin extraerlos
 #-------------------------------------------------------------------------
 import luigi, os
-from os.path import isfile, join
-import zipfile, time
+from os.path import basename, join
+from src.helpers.archives import Archives
+from src.helpers.assets import Assets
+from src.helpers.manifest import Manifest
+import json, zipfile
 
+@Assets.register(".zip")
 class ZIPReader(luigi.Task):
 
+    # reads every member of the archives that changed to check its CRC
+    # before any transformation starts, otherwise a damaged member fails
+    # the transformer that reads it
+    test = luigi.BoolParameter(default=False)
+
     def run(self):
+        # only the central directory of the archives that changed since the
+        # last run is read, the transformers decompress the members as they
+        # read them
+        archives = Assets.targets(ZIPReader)
+        manifest = Manifest.read(self.output())
+        index = ZIPReader.index(self.output())
+        for archive in archives:
+            name = basename(archive.path)
+            entry = manifest["sources"].get(name) if manifest else None
+            if entry is not None and name in index and Manifest.status(archive, entry) == "unchanged":
+                continue
+            if self.test:
+                with zipfile.ZipFile(archive.path) as zfile:
+                    damaged = zfile.testzip()
+                if damaged is not None:
+                    raise RuntimeError(f"member {damaged} of {name} is damaged")
+            index[name] = {member.name: member.describe() for member in Archives.members(archive.path)}
+        names = {basename(archive.path) for archive in archives}
+        with self.output().open('w') as out:
+            json.dump({name: members for name, members in index.items() if name in names}, out, indent=4)
+        Manifest.write(self.output(), archives)
+
+    def complete(self):
+        # the archives are listed again only once one of them changes
+        return super().complete() and Manifest.unchanged(self.output(), Assets.targets(ZIPReader))
+
+    @staticmethod
+    def index(target):
+        # members of every archive listed by the last run
+        try:
+            with target.open() as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def output(self):
         project_dir = os.path.dirname(os.path.abspath("loader.py"))
-        assets_dir = join(project_dir, "assets")
-        files = [f for f in os.listdir(assets_dir) if isfile(join(assets_dir, f))]
-        zip_files = [f for f in files if f.endswith(".zip")]
-        for zip_file in zip_files:
-            file = luigi.LocalTarget(join(assets_dir, zip_file))
-            zfile = zipfile.ZipFile(file.path)
-            for name in zfile.namelist():
-                zfile.extract(name, assets_dir)
-                time.sleep(5)
-            zfile.close()
\ No newline at end of file
+        result_dir = join(project_dir, "result")
+        return luigi.LocalTarget(join(result_dir, "zip.json"))
\ No newline at end of file
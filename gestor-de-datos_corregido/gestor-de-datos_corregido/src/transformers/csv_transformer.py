@@ -11,8 +11,13 @@
 #   y formatear el contenido de un archivo CSV
 #-------------------------------------------------------------------------
 from src.extractors.csv_extractor import CSVExtractor
+from src.helpers.results import ResultConfig, ResultWriter
+from src.helpers.chunks import FileChunks, TransformConfig
+from src.helpers.frames import Frames
+from src.helpers.record import Record
+from src.helpers.manifest import Manifest
 from os.path import join
-import luigi, os, csv, json, re
+import luigi, os, csv, re
 
 class CSVTransformer(luigi.Task):
 
@@ -20,34 +25,67 @@ class CSVTransformer(luigi.Task):
         return CSVExtractor()
 
     def run(self):
-        result = []
-        for file in self.input():
-            with file.open() as csv_file:
-                csv_reader = csv.reader(csv_file)
-                header = []
-                regex = re.compile('[^a-zA-Z]')
-                header = [regex.sub('', column) for column in next(csv_reader)]
-                for row in csv_reader:
-                    entry = dict(zip(header, row))
-                    
-                    if not entry["productdesc"]:
-                        continue
-
-                    result.append(
-                        {
-                            "description": entry["productdesc"],
-                            "quantity": entry["qty"],
-                            "price": entry["rawprice"],
-                            "total": float(entry["qty"]) * float(entry["rawprice"]),
-                            "invoice": entry["inv"],
-                            "provider": entry["provider"],
-                            "country": entry["countryname"]
-                        }
-                    )
-        with self.output().open('w') as out:
-            out.write(json.dumps(result, indent=4))
+        # sources that only grew since the last run are read from where that
+        # run stopped and their rows are added to the output
+        offsets = Manifest.appended(self.output(), self.input(), rb"\n")
+        with Manifest.open(self.output(), offsets) as out:
+            result = ResultWriter(out)
+            # a file may be cut into pieces on line breaks outside quotes
+            for entry in FileChunks.sources(self.input(), CSVTransformer.entries, rb"\n", quote=b'"', offsets=offsets):
+                result.write(entry)
+            result.close()
+        Manifest.write(self.output(), self.input())
+
+    def complete(self):
+        # the output is outdated once a source differs from its manifest
+        return super().complete() and Manifest.unchanged(self.output(), self.input())
+
+    @staticmethod
+    def entries(csv_file):
+        if TransformConfig().engine == "pandas":
+            yield from CSVTransformer.frames(csv_file)
+            return
+        csv_reader = csv.reader(csv_file)
+        header = []
+        regex = re.compile('[^a-zA-Z]')
+        header = [regex.sub('', column) for column in next(csv_reader)]
+        for row in csv_reader:
+            entry = dict(zip(header, row))
+        
+            if not entry["productdesc"]:
+                continue
+
+            yield Record(
+                description=entry["productdesc"],
+                quantity=entry["qty"],
+                price=entry["rawprice"],
+                total=float(entry["qty"]) * float(entry["rawprice"]),
+                invoice=entry["inv"],
+                provider=entry["provider"],
+                country=entry["countryname"]
+            )
+
+    @staticmethod
+    def frames(csv_file):
+        # every column is read as text, rows without description are dropped
+        # with a mask and the totals of the block are computed at once
+        pd = Frames.load()
+        regex = re.compile('[^a-zA-Z]')
+        blocks = pd.read_csv(csv_file, dtype=object, keep_default_na=False, chunksize=Frames.BLOCK_ROWS)
+        for block in blocks:
+            block.columns = [regex.sub('', column) for column in block.columns]
+            block = block[block["productdesc"] != ""]
+            yield from Frames.records(
+                block["productdesc"],
+                block["qty"],
+                block["rawprice"],
+                Frames.total(block["qty"], block["rawprice"]),
+                block["inv"],
+                block["provider"],
+                block["countryname"]
+            )
 
     def output(self):
         project_dir = os.path.dirname(os.path.abspath("loader.py"))
         result_dir = join(project_dir, "result")
-        return luigi.LocalTarget(join(result_dir, "csv.json"))
\ No newline at end of file
+        return ResultConfig.target(result_dir, "csv")
\ No newline at end of file
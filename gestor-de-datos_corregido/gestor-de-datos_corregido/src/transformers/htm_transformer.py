@@ -11,9 +11,13 @@
 #   y formatear el contenido de un archivo HTM
 #-------------------------------------------------------------------------
 from src.extractors.htm_extractor import HTMExtractor
-from bs4 import BeautifulSoup
+from src.helpers.html_table import TableParser
+from src.helpers.results import ResultConfig, ResultWriter
+from src.helpers.chunks import FileChunks
+from src.helpers.manifest import Manifest
+from src.helpers.record import Record
 from os.path import join
-import luigi, os, json
+import luigi, os
 
 class HTMTransformer(luigi.Task):
 
@@ -21,29 +25,36 @@ class HTMTransformer(luigi.Task):
         return HTMExtractor()
 
     def run(self):
-        result = []
-        for file in self.input():
-            with file.open() as htm_file:
-                soup = BeautifulSoup(htm_file)
-                table = soup.find("table", attrs={"class":"table-bordered"})
-                headers = [th.get_text() for th in table.find("tr").find_all("th")]
-                for row in table.find_all("tr")[1:]:
-                    entry = dict(zip(headers, (td.get_text() for td in row.find_all("td"))))
-                    result.append(
-                        {
-                            "description": entry["description_product"],
-                            "quantity": entry["Qty"],
-                            "price": entry["product_price"],
-                            "total": float(entry["Qty"]) * float(entry["product_price"]),
-                            "invoice": entry["order_invoice"],
-                            "provider": entry["id_provider"],
-                            "country": entry["country_location"]
-                        }
-                    )
         with self.output().open('w') as out:
-            out.write(json.dumps(result, indent=4))
+            result = ResultWriter(out)
+            for entry in FileChunks.sources(self.input(), HTMTransformer.entries):
+                result.write(entry)
+            result.close()
+        Manifest.write(self.output(), self.input())
+
+    def complete(self):
+        # the output is outdated once a source differs from its manifest
+        return super().complete() and Manifest.unchanged(self.output(), self.input())
+
+    @staticmethod
+    def entries(htm_file):
+        # the rows are parsed as the file is read, without building the
+        # document tree
+        rows = TableParser.read(htm_file, "table-bordered")
+        headers = [text for tag, text in next(rows) if tag == "th"]
+        for row in rows:
+            entry = dict(zip(headers, (text for tag, text in row if tag == "td")))
+            yield Record(
+                description=entry["description_product"],
+                quantity=entry["Qty"],
+                price=entry["product_price"],
+                total=float(entry["Qty"]) * float(entry["product_price"]),
+                invoice=entry["order_invoice"],
+                provider=entry["id_provider"],
+                country=entry["country_location"]
+            )
 
     def output(self):
         project_dir = os.path.dirname(os.path.abspath("loader.py"))
         result_dir = join(project_dir, "result")
-        return luigi.LocalTarget(join(result_dir, "htm.json"))
\ No newline at end of file
+        return ResultConfig.target(result_dir, "htm")
\ No newline at end of file
@@ -12,39 +12,68 @@
 #-------------------------------------------------------------------------
 
 from src.extractors.txt_extractor import TXTExtractor
+from src.helpers.results import ResultConfig, ResultWriter
+from src.helpers.chunks import FileChunks
+from src.helpers.manifest import Manifest
+from src.helpers.record import Record
 from os.path import join
-import luigi, os, json
+import luigi, os
+
+# characters read from the source file at a time
+CHUNK_SIZE = 64 * 1024
 
 class TXTTransformer(luigi.Task):
     def requires(self):
         return TXTExtractor()
 
     def run(self):
-        result = []
-        for file in self.input():
-            with file.open() as txt_file:
-                data_set = txt_file.readlines()
-                data = data_set[1:]
-                for d in data:
-                    lines = d.strip().split(';')
-                    for line in lines:
-                        fields = line.strip().split(',')
-                        if len(fields) >= 8:
-                            entry = {
-                                "description": fields[2],
-                                "quantity": fields[3],
-                                "price": fields[5],
-                                "total": float(fields[3]) * float(fields[5]),
-                                "invoice": fields[0],
-                                "provider": fields[6],
-                                "country": fields[7]
-                            }
-                            result.append(entry)
-                    
-        with self.output().open('w') as out:
-            out.write(json.dumps(result, indent =4))
+        # sources that only grew since the last run are read from where that
+        # run stopped and their rows are added to the output
+        offsets = Manifest.appended(self.output(), self.input(), rb"[;\n]")
+        with Manifest.open(self.output(), offsets) as out:
+            result = ResultWriter(out)
+            # a file may be cut into pieces after any record
+            for entry in FileChunks.sources(self.input(), TXTTransformer.entries, rb"[;\n]", offsets=offsets):
+                result.write(entry)
+            result.close()
+        Manifest.write(self.output(), self.input())
+
+    def complete(self):
+        # the output is outdated once a source differs from its manifest
+        return super().complete() and Manifest.unchanged(self.output(), self.input())
+
+    @staticmethod
+    def entries(txt_file):
+        # the first line holds the headers
+        txt_file.readline()
+        for line in TXTTransformer.records(txt_file):
+            fields = line.strip().split(',')
+            if len(fields) >= 8:
+                yield Record(
+                    description=fields[2],
+                    quantity=fields[3],
+                    price=fields[5],
+                    total=float(fields[3]) * float(fields[5]),
+                    invoice=fields[0],
+                    provider=fields[6],
+                    country=fields[7]
+                )
+
+    @staticmethod
+    def records(txt_file):
+        # records end with ';' or with a line break and may be split between
+        # two chunks, only one chunk and the pending record are kept in memory
+        pending = ""
+        while True:
+            chunk = txt_file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            records = (pending + chunk).replace("\n", ";").split(";")
+            pending = records.pop()
+            yield from records
+        yield pending
 
     def output(self):
         project_dir = os.path.dirname(os.path.abspath("loader.py"))
         result_dir = join(project_dir, "result")
-        return luigi.LocalTarget(join(result_dir, "txt.json"))
\ No newline at end of file
+        return ResultConfig.target(result_dir, "txt")
\ No newline at end of file
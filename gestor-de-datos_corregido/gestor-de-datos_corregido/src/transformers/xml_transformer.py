@@ -12,8 +12,12 @@
 #-------------------------------------------------------------------------
 from src.extractors.xml_extractor import XMLExtractor
 import xml.etree.ElementTree as ET
+from src.helpers.results import ResultConfig, ResultWriter
+from src.helpers.manifest import Manifest
+from src.helpers.chunks import FileChunks
+from src.helpers.record import Record
 from os.path import join
-import luigi, os, json
+import luigi, os
 
 class XMLTransformer(luigi.Task):
 
@@ -21,27 +25,40 @@ class XMLTransformer(luigi.Task):
         return XMLExtractor()
 
     def run(self):
-        result = []
-        for file in self.input():
-            with file.open() as xml_file:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
-                for row in root.findall('row'):
-                    result.append(
-                        {
-                            "description": row.find('desc').text,
-                            "quantity": row.find('product_qty').text,
-                            "price": row.find('current_price').text,
-                            "total": float(row.find('product_qty').text) * float(row.find('current_price').text),
-                            "invoice": row.find('order_inv').text,
-                            "provider": row.find('provider_identifier').text,
-                            "country": row.find('country_loc').text
-                        }
-                    )
         with self.output().open('w') as out:
-            out.write(json.dumps(result, indent=4))
+            result = ResultWriter(out)
+            # a file may be cut into groups of rows
+            for entry in FileChunks.sources(self.input(), XMLTransformer.entries, rb"</row>", body=(b"<row", b"</row>")):
+                result.write(entry)
+            result.close()
+        Manifest.write(self.output(), self.input())
+
+    def complete(self):
+        # the output is outdated once a source differs from its manifest
+        return super().complete() and Manifest.unchanged(self.output(), self.input())
+
+    @staticmethod
+    def entries(xml_file):
+        # the document is read as a stream, every row is dropped from the
+        # tree once it is written
+        context = ET.iterparse(xml_file, events=("start", "end"))
+        _, root = next(context)
+        for event, row in context:
+            if event != "end" or row.tag != "row":
+                continue
+            fields = {field.tag: field.text for field in row}
+            yield Record(
+                description=fields['desc'],
+                quantity=fields['product_qty'],
+                price=fields['current_price'],
+                total=float(fields['product_qty']) * float(fields['current_price']),
+                invoice=fields['order_inv'],
+                provider=fields['provider_identifier'],
+                country=fields['country_loc']
+            )
+            root.clear()
 
     def output(self):
         project_dir = os.path.dirname(os.path.abspath("loader.py"))
         result_dir = join(project_dir, "result")
-        return luigi.LocalTarget(join(result_dir, "xml.json"))
\ No newline at end of file
+        return ResultConfig.target(result_dir, "xml")
\ No newline at end of file